@@ -0,0 +1,80 @@
+import json
+import random
+from typing import Iterator, List
+
+FIRST_NAMES = ['Александр', 'Михаил', 'Лев', 'Федор', 'Антон', 'Иван', 'Николай', 'Сергей', 'Анна', 'Марина',
+               'Владимир', 'Борис', 'Евгений', 'Ольга', 'Татьяна', 'Константин', 'Андрей', 'Юрий', 'Виктор', 'Ирина']
+LAST_NAMES = ['Пушкин', 'Толстой', 'Достоевский', 'Чехов', 'Тургенев', 'Гоголь', 'Булгаков', 'Набоков', 'Ахматова',
+              'Цветаева', 'Пастернак', 'Бунин', 'Горький', 'Шолохов', 'Платонов', 'Лермонтов', 'Гончаров', 'Куприн',
+              'Паустовский', 'Солженицын', 'Стругацкий', 'Ефремов', 'Беляев', 'Брэдбери', 'Азимов', 'Толкин']
+TITLE_WORDS = ['война', 'мир', 'преступление', 'наказание', 'мастер', 'маргарита', 'отцы', 'дети', 'тихий', 'дон',
+               'мертвые', 'души', 'вишневый', 'сад', 'герой', 'нашего', 'времени', 'белая', 'гвардия', 'обломов',
+               'дорога', 'звезды', 'море', 'город', 'ночь', 'дом', 'сердце', 'собака', 'остров', 'человек',
+               'история', 'путешествие', 'зима', 'лето', 'последний', 'первый', 'тайна', 'письма', 'сказки', 'песнь']
+STATUSES = ['в наличии', 'выдана']
+
+
+def author_names(count: int, seed: int = 0) -> List[str]:
+    """
+    Функция, возвращающая список различных имен авторов.
+
+    :param count: int, количество авторов
+    :param seed: int, начальное значение генератора случайных чисел
+    :return: list[str], имена авторов; при count больше числа сочетаний имен
+        к имени добавляется номер
+    """
+    rng = random.Random(seed)
+    names = [f'{first} {last}' for first in FIRST_NAMES for last in LAST_NAMES]
+    rng.shuffle(names)
+    return [names[i] if i < len(names) else f'{names[i % len(names)]} {i // len(names)}' for i in range(count)]
+
+
+def generate_books(count: int, seed: int = 0) -> Iterator[dict]:
+    """
+    Функция, порождающая синтетический каталог книг.
+
+    Каталог детерминирован для заданных count и seed. Популярность авторов
+    подчиняется закону Ципфа: немногие авторы написали большую часть книг.
+    Названия составлены из одного-четырех слов, поэтому часть названий
+    повторяется. Годы издания смещены к последнему столетию, около
+    пятой части книг выдано.
+
+    :param count: int, количество книг
+    :param seed: int, начальное значение генератора случайных чисел
+    :return: генератор словарей книг в формате файла library.json с id от 1 до count
+    """
+    rng = random.Random(seed)
+    authors = author_names(max(10, count // 20), seed)
+    weights = [1 / rank for rank in range(1, len(authors) + 1)]
+    for book_id, author in enumerate(rng.choices(authors, weights, k=count), start=1):
+        words = rng.sample(TITLE_WORDS, rng.choice((1, 2, 2, 3, 3, 4)))
+        year = 2024 - int(rng.expovariate(1 / 40))
+        yield {
+            'id': book_id,
+            'title': ' '.join(words).capitalize(),
+            'author': author,
+            'year': max(year, 1450),
+            'status': STATUSES[rng.random() < 0.2],
+        }
+
+
+def write_catalog(path: str, count: int, seed: int = 0) -> int:
+    """
+    Функция, записывающая синтетический каталог в JSON-файл.
+
+    Книги записываются по одной, без построения списка в памяти.
+
+    :param path: путь к файлу
+    :param count: int, количество книг
+    :param seed: int, начальное значение генератора случайных чисел
+    :return: int, размер файла в байтах
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('[')
+        for book in generate_books(count, seed):
+            if book['id'] > 1:
+                file.write(',')
+            file.write('\n    ')
+            file.write(json.dumps(book, ensure_ascii=False))
+        file.write('\n]')
+        return file.tell()
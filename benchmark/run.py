@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from benchmark.catalog import generate_books, write_catalog
+from library.library import Library
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def measure(function: Callable[[int], object], calls: int, memory: bool = True) -> dict:
+    """
+    Функция, измеряющая время и пиковую память операции.
+
+    Время измеряется без tracemalloc, затем операция выполняется еще раз
+    под tracemalloc для измерения пиковой памяти.
+
+    :param function: операция, принимающая номер вызова
+    :param calls: int, количество измеряемых вызовов
+    :param memory: bool, измерять ли пиковую память
+    :return: dict, среднее, медианное и минимальное время вызова в секундах
+        и пиковая память вызова в байтах
+    """
+    times = []
+    for i in range(calls):
+        start = time.perf_counter()
+        function(i)
+        times.append(time.perf_counter() - start)
+    result = {
+        'calls': calls,
+        'mean_s': statistics.fmean(times),
+        'median_s': statistics.median(times),
+        'min_s': min(times),
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            function(calls)
+            result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def bench_size(count: int, directory: str, calls: int = 10, seed: int = 0, journal: bool = False,
+               memory: bool = True, log: Callable[[str], object] = lambda message: None) -> dict:
+    """
+    Функция, измеряющая операции библиотеки на каталоге заданного размера.
+
+    :param count: int, количество книг в каталоге
+    :param directory: каталог для файлов библиотеки
+    :param calls: int, количество вызовов каждой операции
+    :param seed: int, начальное значение генератора каталога
+    :param journal: bool, вести ли журнал изменений
+    :param memory: bool, измерять ли пиковую память
+    :param log: функция, получающая сообщения о ходе измерения
+    :return: dict, размер файла и результаты операций
+    """
+    path = os.path.join(directory, f'library_{count}.json')
+    file_bytes = write_catalog(path, count, seed)
+    sample = [book for book in generate_books(min(count, 1000), seed)]
+    popular = max(set(book['author'] for book in sample), key=[book['author'] for book in sample].count)
+    titles = [book['title'] for book in sample]
+    library = Library(path, journal=journal, cache_size=0)  # Повторные запросы измеряют поиск, а не кэш
+    first_new_id = library.next_id
+    operations: Dict[str, dict] = {}
+
+    def run(name: str, function: Callable[[int], object], runs: int = calls):
+        log(f'{count}: {name}')
+        operations[name] = measure(function, runs, memory)
+
+    run('load_books', lambda i: library.load_books(), max(1, min(calls, 3)))
+    run('save_books', lambda i: library.save_books(), max(1, min(calls, 3)))
+    run('add_book', lambda i: library.add_book(f'Новая книга {i}', popular, 2000))
+    run('update_book_status', lambda i: library.update_book_status(i % count + 1, 'выдана'))
+    run('delete_book', lambda i: library.delete_book(first_new_id + i))
+    run('search_book[author]', lambda i: library.search_book(author=popular))
+    run('search_book[title]', lambda i: library.search_book(title=titles[i % len(titles)]))
+    run('search_book[year]', lambda i: library.search_book(year=2000 - i))
+    run('search_book[prefix]', lambda i: library.search_book(mode='prefix', limit=20,
+                                                             title=titles[i % len(titles)][:4]))
+    run('search_book[substring]', lambda i: library.search_book(mode='substring', limit=20,
+                                                                title=titles[i % len(titles)][2:7]))
+    run('search_book[fuzzy]', lambda i: library.search_book(mode='fuzzy', limit=20,
+                                                            author=popular[:-1] + 'ы'))
+    return {'books': count, 'file_bytes': file_bytes, 'operations': operations}
+
+
+def git_commit() -> Optional[str]:
+    """
+    Функция, возвращающая хэш текущего коммита.
+
+    :return: str, хэш коммита или None, если он недоступен
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous: dict, current: dict) -> List[str]:
+    """
+    Функция, сравнивающая два файла результатов.
+
+    :param previous: dict, прежние результаты
+    :param current: dict, новые результаты
+    :return: list[str], строки с отношением медианного времени новых результатов к прежним
+    """
+    lines = []
+    for size, result in current['results'].items():
+        old = previous['results'].get(size)
+        if old is None:
+            continue
+        for name, operation in result['operations'].items():
+            if name in old['operations']:
+                ratio = operation['median_s'] / old['operations'][name]['median_s']
+                lines.append(f'{size:>8} {name:<24} {ratio:6.2f}x')
+    return lines
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Функция запуска измерений из командной строки.
+
+    :param argv: список аргументов; по умолчанию sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(description="Измерение производительности библиотеки")
+    parser.add_argument("--sizes", type=int, nargs='+', default=list(SIZES), help="размеры каталогов")
+    parser.add_argument("--calls", type=int, default=10, help="количество вызовов каждой операции")
+    parser.add_argument("--seed", type=int, default=0, help="начальное значение генератора каталога")
+    parser.add_argument("--journal", action="store_true", help="вести журнал изменений")
+    parser.add_argument("--no-memory", action="store_true", help="не измерять пиковую память")
+    parser.add_argument("--output", default="bench_results.json", help="файл результатов в формате JSON")
+    parser.add_argument("--compare", help="файл прежних результатов для сравнения")
+    args = parser.parse_args(argv)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.sizes:
+            results[str(count)] = bench_size(count, directory, args.calls, args.seed, args.journal,
+                                             not args.no_memory, lambda message: print(message, file=sys.stderr))
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'calls': args.calls,
+            'seed': args.seed,
+            'journal': args.journal,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=4)
+    for size, result in results.items():
+        for name, operation in result['operations'].items():
+            peak = operation.get('peak_bytes')
+            print(f'{size:>8} {name:<24} {operation["median_s"] * 1000:10.3f} ms'
+                  + (f' {peak / 2 ** 20:10.1f} MiB' if peak is not None else ''))
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            print('\n'.join(compare(json.load(file), report)))
+
+
+if __name__ == '__main__':
+    main()
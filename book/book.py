@@ -1,7 +1,19 @@
+import sys
+from datetime import date
+from typing import Tuple
+
+
 class Book:
+    # Книги хранятся в памяти целиком, поэтому вместо __dict__ используются слоты
+    __slots__ = ('book_id', 'title', 'author', 'year', 'status')
+
     def __init__(self, book_id: int, title: str, author: str, year: int, status: str):
         """
         Метод __init__
+
+        Автор и статус повторяются у многих книг, поэтому строки интернируются
+        и разделяются между экземплярами.
+
         :param book_id: id книги
         :param title: название книги
         :param author: автор книги
@@ -10,9 +22,9 @@ class Book:
         """
         self.book_id = book_id
         self.title = title
-        self.author = author
+        self.author = sys.intern(author) if type(author) is str else author
         self.year = year
-        self.status = status
+        self.status = sys.intern(status) if type(status) is str else status
 
     def __str__(self):
         """
@@ -21,6 +33,28 @@ class Book:
         """
         return f"ID: {self.book_id}, Название: {self.title}, Автор: {self.author}, Год издания: {self.year}, Статус: {self.status}"
 
+    def to_dict(self) -> dict:
+        """
+        Метод to_dict
+        :return: dict, словарь с полями книги в формате файла library.json
+        """
+        return {
+            'id': self.book_id,
+            'title': self.title,
+            'author': self.author,
+            'year': self.year,
+            'status': self.status
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Book':
+        """
+        Метод from_dict
+        :param data: словарь с полями книги в формате файла library.json
+        :return: Book
+        """
+        return cls(data['id'], data['title'], data['author'], data['year'], data['status'])
+
     def search(self, **kwargs) -> bool:
         """
         Метод search
@@ -33,7 +67,34 @@ class Book:
         for key, value in kwargs.items():
             if value is not None:  # Проверка на пустоту значения
                 if key == 'year' or key == 'id':
-                    result = self.__dict__.get(key) == int(value) and result
+                    result = getattr(self, key, None) == int(value) and result
                 else:
-                    result = self.__dict__.get(key).lower() == value.lower() and result
+                    result = getattr(self, key, None).lower() == value.lower() and result
         return result
+
+
+def validate_book(title, author, year) -> Tuple[str, str, int]:
+    """
+    Функция validate_book
+
+    Проверяет данные новой книги: название и автор должны быть непустыми
+    строками, год издания - целым числом от 0 до текущего года.
+    Эти правила общие для ввода в меню, пакетного режима, сервера и импорта.
+
+    :param title: название книги
+    :param author: автор книги
+    :param year: год издания книги, int или строка с целым числом
+    :return: tuple, название и автор без пробелов по краям и год издания как int
+    :raises ValueError: если данные книги не корректны
+    """
+    if not isinstance(title, str) or not isinstance(author, str) or not title.strip() or not author.strip():
+        raise ValueError("Данные книги не корректны")
+    if isinstance(year, bool) or not isinstance(year, (int, str)):
+        raise ValueError("Год издания должен быть целым числом")
+    try:
+        year = int(year)
+    except ValueError:
+        raise ValueError("Год издания должен быть целым числом") from None
+    if year < 0 or date.today().year < year:
+        raise ValueError("Год выпуска книги не корректен")
+    return title.strip(), author.strip(), year
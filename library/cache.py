@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+from book.book import Book
+
+
+class SearchCache:
+    """
+    Класс LRU-кэша результатов поиска
+
+    Ключом служат режим поиска, ограничение количества результатов
+    и нормализованные критерии: строки в нижнем регистре, год как целое
+    число, пустые критерии отброшены, порядок критериев не важен.
+    При переполнении удаляется запись, к которой дольше всего не обращались.
+
+    Attributes:
+        maxsize (int): наибольшее количество записей
+        hits (int): количество запросов, найденных в кэше
+        misses (int): количество запросов, не найденных в кэше
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Конструктор класса SearchCache
+
+        :param maxsize: int, наибольшее количество записей
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(mode: str, limit: Optional[int], kwargs: dict) -> Tuple:
+        """
+        Метод, возвращающий ключ кэша для запроса.
+
+        :param mode: str, режим поиска
+        :param limit: int, максимальное количество результатов или None
+        :param kwargs: словарь, содержащий поля, по которым производится поиск
+        :return: tuple, режим, ограничение и отсортированные нормализованные критерии
+        """
+        criteria = []
+        for field, value in kwargs.items():
+            if value is None:
+                continue
+            if field in ('year', 'id'):
+                value = int(value)
+            elif isinstance(value, str):
+                value = value.lower()
+            criteria.append((field, value))
+        criteria.sort()
+        return mode, limit, tuple(criteria)
+
+    def get(self, key: Tuple) -> Optional[List[Book]]:
+        """
+        Метод, возвращающий результаты запроса из кэша.
+
+        :param key: tuple, ключ запроса
+        :return: list[Book], копия сохраненных результатов или None, если запроса нет в кэше
+        """
+        with self._lock:
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(results)
+
+    def put(self, key: Tuple, results: List[Book]):
+        """
+        Метод, сохраняющий результаты запроса в кэше.
+
+        :param key: tuple, ключ запроса
+        :param results: list[Book], результаты запроса
+        """
+        with self._lock:
+            self._entries[key] = list(results)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def evict(self, predicate: Callable[[str, Tuple], bool]) -> int:
+        """
+        Метод, удаляющий записи, для которых предикат истинен.
+
+        :param predicate: функция, принимающая режим поиска и критерии записи
+        :return: int, количество удаленных записей
+        """
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key[0], key[2])]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        """
+        Метод, удаляющий все записи кэша.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> dict:
+        """
+        Метод, возвращающий состояние кэша.
+
+        :return: dict, количество попаданий и промахов, текущий и наибольший размер
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
@@ -0,0 +1,108 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import time
+from typing import Iterable, List, Optional
+from book.book import Book
+from library.importer import FORMATS, detect_format, iter_chunks
+
+FIELDS = ('id', 'title', 'author', 'year', 'status')
+_ENCODER = json.JSONEncoder(ensure_ascii=False)  # json.dumps с параметрами создает кодировщик при каждом вызове
+
+
+def encode_chunk(books: List[Book], file_format: str, header: bool = False) -> bytes:
+    """
+    Функция, преобразующая часть книг в текст файла экспорта.
+
+    Часть JSON-массива содержит только элементы, разделенные запятыми;
+    скобки массива записывает export_books.
+
+    :param books: list[Book], книги
+    :param file_format: str, 'csv', 'jsonl' или 'json'
+    :param header: bool, для CSV - начинать ли часть строкой заголовка,
+        для JSON - является ли часть первой в массиве, то есть не начинается с запятой
+    :return: bytes, строки файла экспорта в кодировке UTF-8
+    """
+    if file_format == 'jsonl':
+        return ''.join(_ENCODER.encode(book.to_dict()) + '\n' for book in books).encode('utf-8')
+    if file_format == 'json':
+        if not books:
+            return b''
+        separator = '\n' if header else ',\n'
+        return (separator + ',\n'.join(_ENCODER.encode(book.to_dict()) for book in books)).encode('utf-8')
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(FIELDS)
+    writer.writerows((book.book_id, book.title, book.author, book.year, book.status) for book in books)
+    return buffer.getvalue().encode('utf-8')
+
+
+def export_books(library, path: str, books: Optional[Iterable[Book]] = None, file_format: Optional[str] = None,
+                 compress: Optional[bool] = None, chunk_size: int = 5000) -> dict:
+    """
+    Функция, потоково выгружающая книги в CSV-, JSONL- или JSON-файл.
+
+    Без books выгружается весь каталог: под блокировкой чтения копируется
+    только список ссылок на книги, поэтому выгрузка не задерживает изменения
+    библиотеки дольше этого копирования. Книги кодируются и записываются
+    частями по chunk_size книг, так что в памяти одновременно находится
+    только одна часть текста. Статус книги берется на момент записи ее части.
+    Файл записывается во временный файл и атомарно заменяет path.
+
+    :param library: Library, библиотека, книги которой выгружаются
+    :param path: путь к файлу экспорта
+    :param books: итерируемый объект книг, например результат search_book или query;
+        None - весь каталог
+    :param file_format: str, 'csv', 'jsonl' или 'json' (JSON-массив, как в library.json);
+        по умолчанию определяется по расширению файла
+    :param compress: bool, сжимать ли файл gzip; по умолчанию определяется по расширению .gz
+    :param chunk_size: int, количество книг в одной части
+    :return: dict, количество выгруженных книг, размер файла в байтах и время выгрузки
+    :raises ValueError: если формат файла неизвестен
+    """
+    start = time.perf_counter()
+    if file_format is None:
+        file_format = detect_format(path, compressed=True)
+    elif file_format not in FORMATS:
+        raise ValueError(f"Неизвестный формат файла экспорта: {file_format}")
+    if compress is None:
+        compress = path.lower().endswith('.gz')
+    books = library.books if books is None else books
+    exported = 0
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    with tempfile.NamedTemporaryFile('wb', dir=directory, delete=False) as file:
+        try:
+            output = gzip.GzipFile(fileobj=file, mode='wb', compresslevel=6) if compress else file
+            if file_format == 'csv':
+                output.write(encode_chunk([], file_format, header=True))
+            elif file_format == 'json':
+                output.write(b'[')
+            for chunk in iter_chunks(books, chunk_size):
+                output.write(encode_chunk(chunk, file_format, header=file_format == 'json' and not exported))
+                exported += len(chunk)
+            if file_format == 'json':
+                output.write(b'\n]\n')
+            if compress:
+                output.close()
+            file.flush()
+            os.fsync(file.fileno())
+            os.chmod(file.name, mode)
+            written = file.tell()
+        except BaseException:
+            file.close()
+            os.unlink(file.name)
+            raise
+    os.replace(file.name, path)
+    return {
+        'exported': exported,
+        'bytes': written,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
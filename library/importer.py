@@ -0,0 +1,198 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+from book.book import validate_book
+from library.stream import iter_json_array
+
+FORMATS = ('csv', 'jsonl', 'json')
+
+
+def detect_format(path: str, compressed: bool = False) -> str:
+    """
+    Функция, определяющая формат файла импорта или экспорта по расширению.
+
+    :param path: путь к файлу
+    :param compressed: bool, пропускать ли расширение .gz сжатого файла
+    :return: str, 'csv', 'jsonl' (расширения .jsonl и .ndjson) или 'json' (JSON-массив)
+    :raises ValueError: если расширение не соответствует известному формату
+    """
+    base, extension = os.path.splitext(path)
+    if compressed and extension.lower() == '.gz':
+        extension = os.path.splitext(base)[1]
+    extension = extension.lower().lstrip('.')
+    if extension == 'ndjson':
+        extension = 'jsonl'
+    if extension not in FORMATS:
+        raise ValueError(f"Неизвестный формат файла: {path}")
+    return extension
+
+
+def read_rows(file, file_format: str) -> Iterator[Tuple[int, object]]:
+    """
+    Функция, последовательно читающая строки файла импорта.
+
+    Строки CSV разбираются здесь, строки JSONL передаются дальше как текст,
+    чтобы их разбор выполнялся параллельно с проверкой. Элементы JSON-массива
+    разбираются потоково и нумеруются с единицы вместо номеров строк.
+
+    :param file: открытый текстовый файл
+    :param file_format: str, 'csv', 'jsonl' или 'json'
+    :return: итератор пар (номер строки файла или элемента массива,
+        словарь CSV, строка JSONL или элемент JSON-массива)
+    :raises json.JSONDecodeError: если файл формата 'json' не является JSON-массивом
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    if file_format == 'json':
+        yield from enumerate(iter_json_array(file), start=1)
+        return
+    for line_number, line in enumerate(file, start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def validate_rows(file_format: str, rows: List[Tuple[int, object]]) -> Tuple[list, list]:
+    """
+    Функция, проверяющая часть строк файла импорта.
+
+    Выполняется в процессах-обработчиках, поэтому определена на уровне модуля.
+    Строки проверяются функцией validate_book, как при добавлении книги из меню.
+
+    :param file_format: str, 'csv', 'jsonl' или 'json'
+    :param rows: list, пары (номер строки, словарь CSV, строка JSONL или элемент JSON-массива)
+    :return: tuple из списка корректных строк (номер, название, автор, год)
+        и списка отклоненных строк (номер, исходная строка, причина)
+    """
+    valid, rejected = [], []
+    for line_number, row in rows:
+        try:
+            data = json.loads(row) if file_format == 'jsonl' else row
+            if not isinstance(data, dict):
+                raise ValueError("Строка не является объектом")
+            title, author, year = validate_book(data.get('title'), data.get('author'), data.get('year'))
+        except ValueError as error:  # json.JSONDecodeError - подкласс ValueError
+            rejected.append((line_number, row, str(error)))
+            continue
+        valid.append((line_number, title, author, year))
+    return valid, rejected
+
+
+def normalize_key(title: str, author: str, year: int) -> Tuple[str, str, int]:
+    """
+    Функция, возвращающая ключ, по которому строки импорта сравниваются с каталогом.
+
+    :param title: str, название книги
+    :param author: str, автор книги
+    :param year: int, год издания книги
+    :return: tuple, название и автор в нижнем регистре с одиночными пробелами и год издания
+    """
+    return ' '.join(title.lower().split()), ' '.join(author.lower().split()), year
+
+
+def iter_chunks(rows: Iterable, size: int) -> Iterator[list]:
+    """
+    Функция, разбивающая строки на части заданного размера.
+
+    :param rows: итерируемый объект строк
+    :param size: int, размер части
+    :return: итератор списков строк
+    """
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _validated(file_format: str, chunks: Iterator[list], executor: Optional[Executor],
+               window: int) -> Iterator[Tuple[list, list]]:
+    """
+    Функция, проверяющая части строк и возвращающая результаты в порядке файла.
+
+    В обработке одновременно находится не более window частей, поэтому
+    файл не читается в память целиком.
+
+    :param file_format: str, 'csv' или 'jsonl'
+    :param chunks: итератор частей строк
+    :param executor: пул процессов или None для проверки в текущем процессе
+    :param window: int, наибольшее количество частей в обработке
+    :return: итератор результатов validate_rows
+    """
+    if executor is None:
+        for chunk in chunks:
+            yield validate_rows(file_format, chunk)
+        return
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(validate_rows, file_format, chunk))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def import_books(library, path: str, file_format: Optional[str] = None, report_path: Optional[str] = None,
+                 chunk_size: int = 5000, workers: Optional[int] = None) -> dict:
+    """
+    Функция, импортирующая книги из CSV-, JSONL- или JSON-файла.
+
+    Файл читается частями по chunk_size строк, части проверяются в пуле
+    процессов. Строки, совпадающие с книгой каталога или с предыдущей
+    строкой файла по названию, автору и году без учета регистра и лишних
+    пробелов, отклоняются как повторы. Корректные книги добавляются
+    в библиотеку одним вызовом Library.add_books, то есть одним сохранением.
+    Отклоненные строки с причинами записываются в отчет в формате JSONL.
+
+    :param library: Library, библиотека, в которую импортируются книги
+    :param path: путь к файлу импорта с полями title, author и year
+    :param file_format: str, 'csv', 'jsonl' или 'json'; по умолчанию определяется по расширению файла
+    :param report_path: путь к отчету об отклоненных строках или None
+    :param chunk_size: int, количество строк в одной части
+    :param workers: int, количество процессов проверки; 0 - проверять в текущем процессе,
+        None - по количеству процессоров
+    :return: dict, количество прочитанных, добавленных, отклоненных и повторных строк и время импорта
+    """
+    start = time.perf_counter()
+    file_format = file_format or detect_format(path)
+    seen = {normalize_key(book.title, book.author, book.year) for book in library.books}
+    accepted = []
+    rejected = []
+    duplicates = 0
+    workers = os.cpu_count() or 1 if workers is None else workers
+    executor = ProcessPoolExecutor(workers) if workers else None
+    try:
+        with open(path, 'r', encoding='utf-8', newline='' if file_format == 'csv' else None) as file:
+            chunks = iter_chunks(read_rows(file, file_format), chunk_size)
+            for valid, invalid in _validated(file_format, chunks, executor, 2 * workers):
+                rejected.extend(invalid)
+                for line_number, title, author, year in valid:
+                    key = normalize_key(title, author, year)
+                    if key in seen:
+                        rejected.append((line_number, {'title': title, 'author': author, 'year': year},
+                                         "Книга уже есть в каталоге"))
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                    accepted.append((title, author, year))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    library.add_books(accepted)
+    if report_path is not None:
+        with open(report_path, 'w', encoding='utf-8') as report:
+            for line_number, row, error in sorted(rejected, key=lambda item: item[0]):
+                report.write(json.dumps({'line': line_number, 'row': row.rstrip('\n') if isinstance(row, str) else row,
+                                         'error': error}, ensure_ascii=False) + '\n')
+    return {
+        'read': len(accepted) + len(rejected),
+        'imported': len(accepted),
+        'rejected': len(rejected) - duplicates,
+        'duplicates': duplicates,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
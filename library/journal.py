@@ -0,0 +1,119 @@
+import json
+import os
+from typing import Iterable, Iterator
+
+
+class Journal:
+    """
+    Класс журнала изменений библиотеки
+
+    Журнал хранит изменения библиотеки в виде JSON-записей, по одной на строку,
+    и только дописывается. Каждая запись описывает одну операцию:
+    {"op": "add", "book": {...}}, {"op": "delete", "id": ...}
+    или {"op": "status", "id": ..., "status": ...}.
+
+    Attributes:
+        path (str): путь к файлу журнала
+        max_records (int): количество записей, после которого нужно уплотнение
+        max_bytes (int): размер журнала в байтах, после которого нужно уплотнение
+        sync (bool): вызывать ли os.fsync после каждой записи
+        records (int): количество записей в журнале
+        size (int): размер журнала в байтах
+    """
+
+    def __init__(self, path: str, max_records: int = 1000, max_bytes: int = 1 << 20, sync: bool = True):
+        """
+        Конструктор класса Journal
+
+        :param path: путь к файлу журнала
+        :param max_records: количество записей, после которого нужно уплотнение
+        :param max_bytes: размер журнала в байтах, после которого нужно уплотнение
+        :param sync: вызывать ли os.fsync после каждой записи
+        """
+        self.path = path
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.sync = sync
+        self.records = 0
+        self.size = os.path.getsize(path) if os.path.exists(path) else 0
+
+    def append(self, records: Iterable[dict]) -> int:
+        """
+        Метод, дописывающий записи в конец журнала одной операцией записи.
+
+        :param records: записи журнала
+        :return: int, количество записанных байт
+        """
+        lines = [json.dumps(record, ensure_ascii=False) + '\n' for record in records]
+        if not lines:
+            return 0
+        data = ''.join(lines).encode('utf-8')
+        with open(self.path, 'ab') as file:
+            file.write(data)
+            file.flush()
+            if self.sync:
+                os.fsync(file.fileno())
+        self.records += len(lines)
+        self.size += len(data)
+        return len(data)
+
+    def replay(self) -> Iterator[dict]:
+        """
+        Метод, последовательно возвращающий записи журнала.
+
+        Чтение останавливается на первой поврежденной или незавершенной
+        строке: такая строка может остаться только от прерванной записи
+        в конец журнала. Журнал обрезается по концу последней целой записи,
+        иначе следующие записи дописывались бы в продолжение оборванной
+        строки и терялись при следующей загрузке.
+
+        :return: итератор записей журнала
+        """
+        self.records = 0
+        if not os.path.exists(self.path):
+            return
+        valid = 0
+        with open(self.path, 'rb') as file:
+            for line in file:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("Запись не завершена")
+                    record = json.loads(line)
+                except ValueError:  # json.JSONDecodeError и UnicodeDecodeError - подклассы ValueError
+                    self._truncate(valid)
+                    return
+                valid += len(line)
+                self.records += 1
+                yield record
+
+    def _truncate(self, size: int):
+        """
+        Метод, обрезающий журнал до заданного размера.
+
+        :param size: int, размер журнала в байтах после обрезки
+        """
+        with open(self.path, 'r+b') as file:
+            file.truncate(size)
+            file.flush()
+            if self.sync:
+                os.fsync(file.fileno())
+        self.size = size
+
+    def needs_compaction(self) -> bool:
+        """
+        Метод, проверяющий, пора ли уплотнить журнал в основной файл.
+
+        :return: bool, True если превышен порог по количеству записей или размеру
+        """
+        return self.records >= self.max_records or self.size >= self.max_bytes
+
+    def clear(self):
+        """
+        Метод, очищающий журнал после записи снимка библиотеки.
+        """
+        with open(self.path, 'wb') as file:
+            file.flush()
+            if self.sync:
+                os.fsync(file.fileno())
+        self.records = 0
+        self.size = 0
@@ -1,6 +1,86 @@
-import json
+import functools
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from itertools import chain, islice
 from book.book import Book
-from typing import List
+from library.cache import SearchCache
+from library.journal import Journal
+from library.locking import FileLock, RWLock
+from library.metrics import Metrics
+from library.ngram import TrigramIndex
+from library.query import And, Eq, Or, Predicate, Range, sort_key
+from library.storage import JsonStorage, Storage
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+SEARCH_MODES = ('exact', 'prefix', 'substring', 'fuzzy')
+FUZZY_THRESHOLD = 0.5
+YEAR_BUCKET = 10
+
+
+def _instrumented(method):
+    """
+    Декоратор метода библиотеки, учитываемого в метриках.
+
+    Имя операции совпадает с именем метода без ведущего подчеркивания.
+
+    :param method: декорируемый метод
+    :return: обернутый метод
+    """
+    name = method.__name__.lstrip('_')
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.metrics is None:
+            return method(self, *args, **kwargs)
+        return self.metrics.call(name, method, self, *args, **kwargs)
+    return wrapper
+
+
+def _reading(method):
+    """
+    Декоратор метода библиотеки, выполняющегося под блокировкой чтения.
+
+    Вызов метода учитывается в метриках. Если библиотека не потокобезопасна
+    и метрики не собираются, метод вызывается напрямую.
+
+    :param method: декорируемый метод
+    :return: обернутый метод
+    """
+    instrumented = _instrumented(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._lock is None:
+            if self.metrics is None:
+                return method(self, *args, **kwargs)
+            return instrumented(self, *args, **kwargs)
+        with self._read_access():
+            return instrumented(self, *args, **kwargs)
+    return wrapper
+
+
+def _writing(method):
+    """
+    Декоратор метода библиотеки, выполняющегося под блокировкой записи.
+
+    Вызов метода учитывается в метриках. Если библиотека не потокобезопасна
+    и метрики не собираются, метод вызывается напрямую.
+
+    :param method: декорируемый метод
+    :return: обернутый метод
+    """
+    instrumented = _instrumented(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._lock is None:
+            if self.metrics is None:
+                return method(self, *args, **kwargs)
+            return instrumented(self, *args, **kwargs)
+        with self._write_access():
+            return instrumented(self, *args, **kwargs)
+    return wrapper
 
 
 class Library:
@@ -9,22 +89,326 @@ class Library:
 
     Attributes:
         file_path (str): путь к файлу с данными библиотеки
-        _books (list): список книг
+        storage (Storage): хранилище, из которого загружаются и в котором сохраняются книги
+        _index (dict): индекс книг по id, хранящий порядок добавления
+        _title_index (dict): индекс книг по названию в нижнем регистре
+        _author_index (dict): индекс книг по автору в нижнем регистре
+        _year_index (dict): индекс книг по году издания
+        _years (list): отсортированный список годов, присутствующих в индексе
+        _status_counts (dict): количество книг по статусу
+        _author_counts (dict): количество книг по автору в написании книги
+        _bucket_counts (dict): количество книг по периоду в YEAR_BUCKET лет,
+            обозначенному первым годом периода
+        _title_grams (TrigramIndex): индекс триграмм различных названий в нижнем регистре
+            или None, пока он не понадобился поиску
+        _author_grams (TrigramIndex): индекс триграмм различных авторов в нижнем регистре
+            или None, пока он не понадобился поиску
+        _pending (list): записи изменений открытой транзакции или None
+        _undo (list): журнал отмены открытой транзакции или None; в него
+            записываются вставки, удаления и изменения статусов книг
+        _max_id (int): наибольший id среди добавленных в индекс книг
         _next_id (int): следующий id книги
+        _lock (RWLock): блокировка чтения-записи или None, если библиотека не потокобезопасна
+        _file_lock (FileLock): межпроцессная блокировка или None
+        _version (tuple): версия хранилища, из которой загружены книги
+        metrics (Metrics): метрики операций или None, если метрики не собираются
+        _cache (SearchCache): кэш результатов поиска или None, если кэш отключен
+        _unloaded (set): номера разделов хранилища, книги которых еще не загружены
+        _resident (bool): загружен ли каталог в память; False, пока книги хранилища
+            с запросами (Storage.queryable) читаются запросами к нему
 
     """
 
-    def __init__(self, file_path='library.json'):
+    def __init__(self, file_path='library.json', journal: bool = False, storage: Optional[Storage] = None,
+                 thread_safe: bool = False, process_safe: bool = False, metrics: Optional[Metrics] = None,
+                 cache_size: int = 128):
         """
         Конструктор класса Library
 
         :param file_path: путь к файлу с данными библиотеки
+        :param journal: bool, вести ли журнал изменений рядом с файлом вместо
+            перезаписи файла после каждого изменения
+        :param storage: хранилище книг; по умолчанию JsonStorage(file_path, journal)
+        :param thread_safe: bool, защищать ли библиотеку блокировкой чтения-записи
+            для использования из нескольких потоков
+        :param process_safe: bool, согласовывать ли изменения с другими процессами,
+            работающими с тем же файлом; включает thread_safe
+        :param metrics: метрики, в которых учитываются операции библиотеки; None - не собирать метрики
+        :param cache_size: int, наибольшее количество запросов в кэше результатов поиска; 0 - без кэша
         """
         self.file_path = file_path
+        self.storage = storage if storage is not None else JsonStorage(file_path, journal)
+        self._lock = RWLock() if thread_safe or process_safe else None
+        self._file_lock = FileLock(file_path + '.lock') if process_safe else None
+        self._version = None
+        self.metrics = metrics
+        self._cache = SearchCache(cache_size) if cache_size else None
+        self._index: Dict[int, Book] = {}
+        self._title_index: Dict[str, Dict[int, Book]] = {}
+        self._author_index: Dict[str, Dict[int, Book]] = {}
+        self._year_index: Dict[int, Dict[int, Book]] = {}
+        self._years: List[int] = []
+        self._status_counts: Dict[str, int] = {}
+        self._author_counts: Dict[str, int] = {}
+        self._bucket_counts: Dict[int, int] = {}
+        self._title_grams: Optional[TrigramIndex] = None
+        self._author_grams: Optional[TrigramIndex] = None
+        self._pending = None
+        self._undo = None
+        self._max_id = 0
+        self._unloaded: Set[int] = set()
+        self._resident = True
+        shards = self.storage.shards() if self._lock is None else None
+        if self._lock is None and self.storage.queryable:  # Каталог загружается, когда понадобится целиком
+            self._resident = False
+            self._next_id = self.get_next_id()
+        elif shards:  # Разделы загружаются по мере обращения к ним, сначала только последний непустой
+            self._unloaded = set(shards)
+            for shard in reversed(shards):
+                self._load_shard(shard)
+                if self._index:
+                    break
+            self._next_id = self.get_next_id()
+        elif self._file_lock is None:
+            self._books = self.load_books()
+            self._next_id = self.get_next_id()
+        else:
+            with self._file_lock.acquire(shared=True):
+                self._reload()
+
+    def _reload(self):
+        """
+        Метод, заново загружающий книги из хранилища и запоминающий его версию.
+        """
         self._books = self.load_books()
         self._next_id = self.get_next_id()
+        self._version = self.storage.version()
+
+    def _load_shard(self, shard: int):
+        """
+        Метод, добавляющий в индексы книги еще не загруженного раздела хранилища.
+
+        :param shard: int, номер раздела
+        """
+        if shard in self._unloaded:
+            self._unloaded.discard(shard)
+            if self._undo is not None:
+                self._undo.append(('unloaded', {shard}))
+            for book in self.storage.load_shard(shard):
+                self._insert(book)
+
+    def _require(self, *book_ids: int):
+        """
+        Метод, загружающий разделы хранилища, в которых лежат книги с заданными id.
+
+        :param book_ids: id книг
+        """
+        if self._unloaded:
+            for shard in {self.storage.shard_of(book_id) for book_id in book_ids}:
+                self._load_shard(shard)
+
+    def _require_all(self):
+        """
+        Метод, загружающий все еще не загруженные разделы хранилища.
+
+        Разделы загружаются в порядке обращения к ним, поэтому после загрузки
+        книги упорядочиваются по id, то есть в порядке добавления.
+        Каталог хранилища с запросами загружается целиком.
+        """
+        if not self._resident:
+            self._books = self.load_books()
+            self._resident = True
+        if self._unloaded:
+            fetched = []
+            for shard in sorted(self._unloaded):
+                fetched.extend(self.storage.load_shard(shard))
+            unloaded, self._unloaded = self._unloaded, set()
+            self._books = sorted([*self._index.values(), *fetched], key=lambda book: book.book_id)
+            if self._undo is not None:
+                self._undo.append(('unloaded', unloaded))
+                self._undo.extend(('insert', book) for book in fetched)
+
+    @contextmanager
+    def _read_access(self) -> Iterator[None]:
+        """
+        Контекстный менеджер доступа на чтение.
+
+        Если хранилище изменено другим процессом, книги сначала загружаются заново.
+        Загрузка выполняется, только если версия хранилища действительно изменилась.
+        """
+        if self._file_lock is not None and not self._lock.held() and self.storage.version() != self._version:
+            with self._lock.write(), self._file_lock.acquire(shared=True):
+                if self.storage.version() != self._version:
+                    self._reload()
+        with self._lock.read():
+            yield
+
+    @contextmanager
+    def _write_access(self) -> Iterator[None]:
+        """
+        Контекстный менеджер доступа на запись.
+
+        Захватывает блокировку записи и, если библиотека согласуется с другими
+        процессами, монопольную файловую блокировку. Если хранилище изменено
+        другим процессом, книги загружаются заново до выполнения изменения,
+        поэтому чужие изменения не теряются. После изменения запоминается
+        новая версия хранилища.
+        """
+        with self._lock.write():
+            if self._file_lock is None:
+                yield
+                return
+            with self._file_lock.acquire() as outer:
+                if outer and self.storage.version() != self._version:
+                    self._reload()
+                yield
+                if outer:
+                    self._version = self.storage.version()
+
+    @property
+    def _books(self) -> List[Book]:
+        """
+        Property, возвращающий список книг в порядке добавления.
+
+        Returns:
+            list: список книг
+        """
+        return list(self._index.values())
+
+    @_books.setter
+    def _books(self, books: List[Book]):
+        """
+        Setter, заменяющий список книг и перестраивающий все индексы.
+
+        Перестроение не записывается в журнал отмены транзакции.
+
+        :param books: list[Book], новый список книг
+        """
+        undo, self._undo = self._undo, None
+        if self._cache is not None:
+            self._cache.clear()
+        self._index = {}
+        self._title_index = {}
+        self._author_index = {}
+        self._year_index = {}
+        self._years = []
+        self._status_counts = {}
+        self._author_counts = {}
+        self._bucket_counts = {}
+        self._title_grams = None
+        self._author_grams = None
+        self._max_id = 0
+        for book in books:
+            self._insert(book)
+        self._undo = undo
+
+    def _insert(self, book: Book):
+        """
+        Метод, добавляющий книгу в индекс по id и во вторичные индексы.
+
+        Списки вхождений вторичных индексов являются словарями, поэтому
+        сохраняют порядок добавления книг в библиотеку.
+
+        :param book: Book, добавляемая книга
+        """
+        if self._undo is not None:
+            self._undo.append(('insert', book))
+        self._index[book.book_id] = book
+        if book.book_id > self._max_id:
+            self._max_id = book.book_id
+        title_key = book.title.lower()
+        if title_key not in self._title_index:
+            self._title_index[title_key] = {}
+            if self._title_grams is not None:
+                self._title_grams.add(title_key)
+        self._title_index[title_key][book.book_id] = book
+        author_key = book.author.lower()
+        if author_key not in self._author_index:
+            self._author_index[author_key] = {}
+            if self._author_grams is not None:
+                self._author_grams.add(author_key)
+        self._author_index[author_key][book.book_id] = book
+        if book.year not in self._year_index:
+            self._year_index[book.year] = {}
+            insort(self._years, book.year)
+        self._year_index[book.year][book.book_id] = book
+        self._count(self._status_counts, book.status, 1)
+        self._count(self._author_counts, book.author, 1)
+        self._count(self._bucket_counts, book.year // YEAR_BUCKET * YEAR_BUCKET, 1)
+
+    def _remove(self, book_id: int) -> bool:
+        """
+        Метод, удаляющий книгу из индекса по id и из вторичных индексов.
+
+        :param book_id: int, id удаляемой книги
+        :return: bool, True если книга была удалена, False если не найдена
+        """
+        book = self._index.pop(book_id, None)
+        if book is None:
+            return False
+        if self._undo is not None:
+            self._undo.append(('remove', book))
+        if self._discard(self._title_index, book.title.lower(), book_id) and self._title_grams is not None:
+            self._title_grams.remove(book.title.lower())
+        if self._discard(self._author_index, book.author.lower(), book_id) and self._author_grams is not None:
+            self._author_grams.remove(book.author.lower())
+        if self._discard(self._year_index, book.year, book_id):
+            del self._years[bisect_left(self._years, book.year)]
+        self._count(self._status_counts, book.status, -1)
+        self._count(self._author_counts, book.author, -1)
+        self._count(self._bucket_counts, book.year // YEAR_BUCKET * YEAR_BUCKET, -1)
+        return True
+
+    @staticmethod
+    def _count(counts: dict, key, delta: int):
+        """
+        Метод, изменяющий счетчик сводки; счетчик, ставший нулевым, удаляется.
+
+        :param counts: dict, счетчики сводки
+        :param key: ключ счетчика
+        :param delta: int, изменение счетчика
+        """
+        count = counts.get(key, 0) + delta
+        if count:
+            counts[key] = count
+        else:
+            del counts[key]
+
+    def _set_status(self, book: Book, status: str):
+        """
+        Метод, изменяющий статус книги вместе со счетчиками статусов.
+
+        :param book: Book, книга из индекса
+        :param status: str, новый статус книги
+        """
+        if not self._resident:  # Книга получена запросом к хранилищу и не входит в счетчики
+            book.status = status
+            return
+        if self._undo is not None:
+            self._undo.append(('status', book, book.status))
+        self._count(self._status_counts, book.status, -1)
+        book.status = status
+        self._count(self._status_counts, status, 1)
+
+    @staticmethod
+    def _discard(index: dict, key, book_id: int) -> bool:
+        """
+        Метод, удаляющий книгу из списка вхождений вторичного индекса.
+
+        :param index: dict, вторичный индекс
+        :param key: ключ индекса
+        :param book_id: int, id удаляемой книги
+        :return: bool, True если список вхождений стал пустым и ключ был удален
+        """
+        postings = index[key]
+        del postings[book_id]
+        if postings:
+            return False
+        del index[key]
+        return True
 
     @property
+    @_reading
     def books(self) -> List[Book]:
         """
         Property, возвращающий список книг библиотеки
@@ -32,9 +416,38 @@ class Library:
         Returns:
             list: список книг
         """
+        self._require_all()
         return self._books
 
+    @_reading
+    def page(self, offset: int, limit: int) -> List[Book]:
+        """
+        Метод, возвращающий часть списка книг в порядке добавления.
+
+        Копируются только книги страницы, а не весь список книг.
+
+        :param offset: int, количество пропускаемых книг
+        :param limit: int, наибольшее количество книг на странице
+        :return: list[Book], книги страницы
+        :raises ValueError: если offset или limit отрицательны
+        """
+        if offset < 0 or limit < 0:
+            raise ValueError("offset и limit должны быть неотрицательными")
+        self._require_all()
+        return list(islice(self._index.values(), offset, offset + limit))
+
+    @property
+    def journal(self) -> Optional[Journal]:
+        """
+        Property, возвращающий журнал изменений хранилища
+
+        Returns:
+            Journal: журнал изменений или None, если журнал отключен
+        """
+        return getattr(self.storage, 'journal', None)
+
     @property
+    @_reading
     def next_id(self) -> int:
         """
         Property, возвращающий следующий id книги
@@ -44,49 +457,59 @@ class Library:
         """
         return self._next_id
 
+    @_instrumented
     def load_books(self) -> List[Book]:
         """
-        Метод, загружающий список книг из файла.
+        Метод, загружающий список книг из хранилища.
 
         :return: list[book], Список книг
         """
-        result = []
-        with open(self.file_path, 'r', encoding='utf-8') as file:
-            try:
-                temp_result = json.load(file)
-                for book in temp_result:
-                    result.append(Book(book['id'], book['title'], book['author'], book['year'], book['status']))
-                return result
-            except json.JSONDecodeError:
-                return result
+        return self.storage.load()
 
     def get_next_id(self) -> int:
         """
         Метод, возвращающий следующий id книги.
 
+        Наибольший id отслеживается при добавлении книг в индекс,
+        поэтому отдельного прохода по списку книг не требуется. Пока каталог
+        не загружен, наибольший id запрашивается у хранилища.
+
         :return: int, следующий id книги
         """
-        return max([book.book_id for book in self._books], default=0) + 1
+        if not self._resident:
+            return self.storage.max_id() + 1
+        return self._max_id + 1
 
+    @_writing
     def save_books(self):
         """
-        Метод, сохраняющий список книг в файл
+        Метод, сохраняющий список книг в хранилище
 
-        Метод проходит по списку книг, создает из них словари,
-        и сохраняет их в файле, указанном в self.file_path
+        Хранилище перезаписывается целиком.
         """
-        result = []
-        with open(self.file_path, 'w', encoding='utf-8') as file:
-            for book in self.books:
-                result.append({
-                    'id': book.book_id,
-                    'title': book.title,
-                    'author': book.author,
-                    'year': book.year,
-                    'status': book.status
-                })
-            json.dump(result, file, ensure_ascii=False, indent=4)
+        self._require_all()
+        written = self.storage.save(self._index.values())
+        if self.metrics is not None and written is not None:
+            self.metrics.record_bytes(written)
+
+    @_instrumented
+    def _persist(self, *records: dict):
+        """
+        Метод, сохраняющий изменения библиотеки.
+
+        Внутри транзакции записи накапливаются, иначе сразу передаются
+        хранилищу, которое само решает, как их сохранить.
 
+        :param records: записи, описывающие изменения
+        """
+        if self._pending is not None:  # Сохранение отложено до конца транзакции
+            self._pending.extend(records)
+            return
+        written = self.storage.apply(records, self._index.values())
+        if self.metrics is not None and written is not None:
+            self.metrics.record_bytes(written)
+
+    @_writing
     def add_book(self, book_title: str, book_author: str, book_year: int):
         """
         Метод, добавляющий книгу в список книг.
@@ -95,11 +518,37 @@ class Library:
         :param book_author: str, Автор книги
         :param book_year: int, Год издания книги
         """
+        self._require(self._next_id)
         book = Book(self._next_id, book_title, book_author, book_year, status='в наличии')
-        self._books.append(book)
+        if self._resident:
+            self._insert(book)
+        self._evict(book)
         self._next_id += 1
-        self.save_books()
+        self._persist({'op': 'add', 'book': book.to_dict()})
+
+    @_writing
+    def add_books(self, books: Iterable[Tuple[str, str, int]]) -> List[Book]:
+        """
+        Метод, добавляющий несколько книг с одним сохранением.
+
+        Id выдаются подряд начиная с self._next_id.
+
+        :param books: итерируемый объект кортежей (название, автор, год издания)
+        :return: list[Book], список добавленных книг
+        """
+        added = [Book(book_id, book_title, book_author, book_year, status='в наличии')
+                 for book_id, (book_title, book_author, book_year) in enumerate(books, start=self._next_id)]
+        self._require(*(book.book_id for book in added))
+        if self._resident:
+            for book in added:
+                self._insert(book)
+        self._evict(*added)
+        self._next_id += len(added)
+        if added:
+            self._persist(*[{'op': 'add', 'book': book.to_dict()} for book in added])
+        return added
 
+    @_writing
     def delete_book(self, book_id: int) -> bool:
         """
         Метод, удаляющий книгу из списка книг.
@@ -107,23 +556,407 @@ class Library:
         :param book_id: int, id книги, которую нужно удалить
         :return: bool, True если книга была удалена, False если не найдена
         """
-        for book in self._books:
-            if book.book_id == book_id:
-                self._books.remove(book)
-                self.save_books()
-                return True
-        return False
+        book = self._lookup(book_id)
+        if book is None:
+            return False
+        self._evict(book)
+        if self._resident:
+            self._remove(book_id)
+        self._persist({'op': 'delete', 'id': book_id})
+        return True
 
-    def search_book(self, **kwargs) -> List[Book]:
+    @_reading
+    def search_book(self, mode: str = 'exact', limit: Optional[int] = None, **kwargs) -> List[Book]:
         """
         Метод, выполняющий поиск книг по заданным критериям.
 
+        В режиме 'exact' название и автор сравниваются целиком без учета
+        регистра, и результаты возвращаются в порядке добавления книг.
+        В режимах 'prefix', 'substring' и 'fuzzy' название и автор ищутся
+        по началу строки, по подстроке или с допуском опечаток, а результаты
+        упорядочиваются по убыванию релевантности. Остальные критерии
+        во всех режимах проверяются на точное совпадение.
+
+        Пока каталог хранилища с запросами не загружен, поиск в режиме 'exact'
+        выполняется запросом к хранилищу, остальные режимы загружают каталог.
+
+        Результаты запросов сохраняются в LRU-кэше. Изменение книги удаляет
+        из кэша только запросы, критериям которых книга удовлетворяла
+        до или после изменения.
+
+        :param mode: str, режим поиска: 'exact', 'prefix', 'substring' или 'fuzzy'
+        :param limit: int, максимальное количество результатов или None
+        :param kwargs: словарь, содержащий поля, по которым производится поиск
+        :return: list[Book], список книг, удовлетворяющих критериям поиска
+        :raises ValueError: если режим поиска неизвестен
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Неизвестный режим поиска: {mode}")
+        if self._resident or mode != 'exact':
+            self._require_all()
+        if self._cache is None:
+            return self._search(mode, limit, kwargs)
+        key = self._cache.key(mode, limit, kwargs)
+        results = self._cache.get(key)
+        if results is None:
+            results = self._search(mode, limit, kwargs)
+            self._cache.put(key, results)
+        return results
+
+    def _search(self, mode: str, limit: Optional[int], kwargs: dict) -> List[Book]:
+        """
+        Метод, выполняющий поиск без обращения к кэшу.
+
+        :param mode: str, режим поиска
+        :param limit: int, максимальное количество результатов или None
+        :param kwargs: словарь, содержащий поля, по которым производится поиск
+        :return: list[Book], список книг, удовлетворяющих критериям поиска
+        """
+        if mode != 'exact' and any(kwargs.get(key) is not None for key in ('title', 'author')):
+            return self._search_ranked(mode, limit, kwargs)
+        if not self._resident:
+            return self.storage.search(limit, **kwargs)
+        results = self._search_exact(kwargs)
+        return results if limit is None else results[:limit]
+
+    def _search_exact(self, kwargs: dict) -> List[Book]:
+        """
+        Метод, выполняющий поиск книг на точное совпадение критериев.
+
+        Критерии по названию, автору и году разрешаются через вторичные
+        индексы: списки вхождений пересекаются начиная с самого короткого,
+        остальные критерии проверяются методом Book.search у оставшихся книг.
+        Результаты возвращаются в порядке добавления книг в библиотеку.
+
         :param kwargs: словарь, содержащий поля, по которым производится поиск
         :return: list[Book], список книг, удовлетворяющих критериям поиска
         """
-        results = [book for book in self._books if book.search(**kwargs)]
+        if all(value is None for value in kwargs.values()):  # Проверка на пустой словарь
+            return []
+        postings = []
+        rest = {}
+        for key, value in kwargs.items():
+            if value is None:
+                continue
+            if key == 'title':
+                postings.append(self._title_index.get(value.lower(), {}))
+            elif key == 'author':
+                postings.append(self._author_index.get(value.lower(), {}))
+            elif key == 'year':
+                postings.append(self._year_index.get(int(value), {}))
+            else:
+                rest[key] = value
+        if not postings:
+            if self.metrics is not None:
+                self.metrics.record_scanned(len(self._index))
+            return [book for book in self._index.values() if book.search(**kwargs)]
+        postings.sort(key=len)
+        first, others = postings[0], postings[1:]
+        if self.metrics is not None:
+            self.metrics.record_scanned(len(first))
+        results = [book for book_id, book in first.items()
+                   if all(book_id in other for other in others) and (not rest or book.search(**rest))]
+        return results
+
+    def _search_ranked(self, mode: str, limit: Optional[int], kwargs: dict) -> List[Book]:
+        """
+        Метод, выполняющий поиск по началу строки, подстроке или с допуском опечаток.
+
+        Оценка книги равна сумме оценок совпадения ее названия и автора.
+        При равных оценках книги упорядочиваются по id. Если задан limit,
+        выбираются limit лучших книг без полной сортировки.
+
+        :param mode: str, режим поиска: 'prefix', 'substring' или 'fuzzy'
+        :param limit: int, максимальное количество результатов или None
+        :param kwargs: словарь, содержащий поля, по которым производится поиск
+        :return: list[Book], список книг по убыванию релевантности
+        """
+        scores = None
+        rest = {}
+        for key, value in kwargs.items():
+            if value is None:
+                continue
+            if key not in ('title', 'author'):
+                rest[key] = value
+                continue
+            index = self._title_index if key == 'title' else self._author_index
+            found = {}
+            for text_key, score in self._match_keys(key, value.lower(), mode).items():
+                for book_id in index[text_key]:
+                    found[book_id] = score
+            if scores is None:
+                scores = found
+            else:
+                scores = {book_id: score + found[book_id] for book_id, score in scores.items() if book_id in found}
+        if self.metrics is not None:
+            self.metrics.record_scanned(len(scores))
+        candidates = ((book_id, score) for book_id, score in scores.items()
+                      if not rest or self._index[book_id].search(**rest))
+        if limit is None:
+            ranked = sorted(candidates, key=lambda item: (-item[1], item[0]))
+        else:
+            ranked = heapq.nsmallest(limit, candidates, key=lambda item: (-item[1], item[0]))
+        return [self._index[book_id] for book_id, _ in ranked]
+
+    def _grams(self, field: str) -> TrigramIndex:
+        """
+        Метод, возвращающий индекс триграмм поля, при необходимости строя его.
+
+        Индексы триграмм нужны только поиску по началу строки, подстроке
+        и с допуском опечаток, поэтому они строятся при первом таком поиске,
+        а не при загрузке библиотеки.
+
+        :param field: str, 'title' или 'author'
+        :return: TrigramIndex, индекс триграмм различных значений поля
+        """
+        if field == 'title':
+            if self._title_grams is None:
+                self._title_grams = TrigramIndex(self._title_index)
+            return self._title_grams
+        if self._author_grams is None:
+            self._author_grams = TrigramIndex(self._author_index)
+        return self._author_grams
+
+    def _match_keys(self, field: str, query: str, mode: str) -> Dict[str, float]:
+        """
+        Метод, подбирающий различные названия или авторов, подходящих под запрос.
+
+        Кандидаты выбираются по индексу триграмм. Запросы короче трех символов
+        не содержат триграмм, поэтому для них перебираются различные значения
+        поля, а не книги. Совпадение по началу строки оценивается выше
+        совпадения в середине, а более короткие строки выше длинных.
+
+        :param field: str, 'title' или 'author'
+        :param query: str, запрос в нижнем регистре
+        :param mode: str, режим поиска: 'prefix', 'substring' или 'fuzzy'
+        :return: dict, оценка совпадения для каждого подходящего значения
+        """
+        index = self._title_index if field == 'title' else self._author_index
+        if len(query) < 3:
+            keys = index.keys()
+        elif mode == 'fuzzy':
+            return self._grams(field).similar(query, FUZZY_THRESHOLD)
+        else:
+            keys = self._grams(field).candidates(query)
+        matches = {}
+        for key in keys:
+            if key.startswith(query):
+                matches[key] = 1 + len(query) / max(len(key), 1)
+            elif mode != 'prefix' and query in key:
+                matches[key] = len(query) / len(key)
+        return matches
+
+    @staticmethod
+    def _matches(book: Book, mode: str, criteria: Tuple) -> bool:
+        """
+        Метод, проверяющий, удовлетворяет ли книга критериям запроса из кэша.
+
+        Проверка повторяет правила поиска: в режимах 'prefix', 'substring'
+        и 'fuzzy' название и автор сравниваются так же, как в _match_keys.
+        Если критерии не удается проверить, считается, что книга им удовлетворяет.
+
+        :param book: Book, книга
+        :param mode: str, режим поиска
+        :param criteria: tuple, нормализованные критерии из ключа SearchCache
+        :return: bool, True если книга удовлетворяет критериям
+        """
+        rest = {}
+        try:
+            for key, value in criteria:
+                if mode == 'exact' or key not in ('title', 'author'):
+                    rest[key] = value
+                    continue
+                text = getattr(book, key).lower()
+                if mode == 'fuzzy' and len(value) >= 3:
+                    grams = TrigramIndex.trigrams(value)
+                    if len(grams & TrigramIndex.trigrams(text)) / len(grams) < FUZZY_THRESHOLD:
+                        return False
+                elif not (text.startswith(value) or (mode != 'prefix' and value in text)):
+                    return False
+            return not rest or book.search(**rest)
+        except (AttributeError, TypeError, ValueError):
+            return True
+
+    def _evict(self, *books: Book):
+        """
+        Метод, удаляющий из кэша запросы, критериям которых удовлетворяет хотя бы одна из книг.
+
+        Если книг больше, чем записей может поместиться в кэш, кэш очищается
+        целиком: проверка каждой записи обошлась бы дороже повторных запросов.
+
+        :param books: добавленные, удаляемые или изменяемые книги
+        """
+        if self._cache is None or not self._cache:
+            return
+        if len(books) > self._cache.maxsize:
+            self._cache.clear()
+            return
+        self._cache.evict(lambda mode, criteria: any(self._matches(book, mode, criteria) for book in books))
+
+    @_reading
+    def query(self, where: Optional[Predicate] = None, order_by: Optional[str] = None,
+              limit: Optional[int] = None) -> Iterator[Book]:
+        """
+        Метод, выполняющий запрос с условиями, упорядочиванием и ограничением количества.
+
+        Планировщик выбирает из условий, связанных через And, самый короткий
+        набор кандидатов: списки вхождений индексов названий и авторов,
+        список вхождений по id или годы диапазона, найденные бинарным поиском
+        в отсортированном списке годов. Условие Or использует индексы, только
+        если их могут использовать все его ветви. Без подходящего индекса
+        просматриваются все книги. Каждый кандидат проверяется условием целиком.
+
+        При упорядочивании по году книги перебираются по годам в нужном
+        направлении, и перебор заканчивается, как только набрано limit книг.
+        При упорядочивании по другому полю limit лучших книг выбирается
+        через heapq без полной сортировки. Без упорядочивания книги
+        возвращаются в порядке добавления. При равных значениях поля
+        книги упорядочиваются в порядке добавления.
+
+        Результаты возвращаются генератором и вычисляются по мере перебора,
+        поэтому библиотеку нельзя изменять, пока перебор не закончен.
+        В потокобезопасной библиотеке результаты вычисляются сразу под
+        блокировкой чтения.
+
+        :param where: условие запроса или None, чтобы выбрать все книги
+        :param order_by: str, поле упорядочивания; с префиксом '-' - по убыванию; None - без упорядочивания
+        :param limit: int, максимальное количество результатов или None
+        :return: итератор книг, удовлетворяющих условию
+        :raises ValueError: если поле упорядочивания неизвестно
+        """
+        self._require_all()
+        field, descending, key = sort_key(order_by) if order_by is not None else (None, False, None)
+        candidates = self._candidates(where) if where is not None else None
+        if field == 'year' and (candidates is None or candidates[1]):
+            years = candidates[0] if candidates is not None else [self._year_index[year] for year in self._years]
+            results = self._scan_years(years[::-1] if descending else years, where)
+        else:
+            if candidates is None:
+                books = self._index.values()
+            elif key is None:
+                books = self._merge(*candidates)
+            elif candidates[1]:  # Порядок кандидатов не важен, потому что результаты упорядочиваются по ключу
+                books = chain.from_iterable(entries.values() for entries in candidates[0])
+            else:
+                books = {book.book_id: book for entries in candidates[0] for book in entries.values()}.values()
+            if where is not None:
+                books = filter(where.matches, books)
+            if key is None:
+                results = books
+            elif limit is None:
+                results = iter(sorted(books, key=key, reverse=descending))
+            else:
+                results = iter((heapq.nlargest if descending else heapq.nsmallest)(limit, books, key=key))
+        if limit is not None:
+            results = islice(results, limit)
+        if self._lock is not None:
+            return iter(list(results))
         return results
 
+    @staticmethod
+    def _scan_years(years: List[Dict[int, Book]], where: Optional[Predicate]) -> Iterator[Book]:
+        """
+        Генератор, перебирающий книги по спискам вхождений годов в заданном порядке.
+
+        :param years: списки вхождений индекса по году в порядке перебора
+        :param where: условие запроса или None
+        :return: итератор книг, удовлетворяющих условию
+        """
+        for postings in years:
+            for book in postings.values():
+                if where is None or where.matches(book):
+                    yield book
+
+    @staticmethod
+    def _merge(postings: List[Mapping[int, Book]], by_year: bool) -> Iterator[Book]:
+        """
+        Метод, объединяющий списки вхождений в порядке добавления книг.
+
+        Списки вхождений упорядочены по добавлению, поэтому объединяются
+        слиянием. Списки разных годов не пересекаются, остальные могут
+        пересекаться, и повторы пропускаются.
+
+        :param postings: списки вхождений
+        :param by_year: bool, являются ли списки вхождениями различных годов
+        :return: итератор книг
+        """
+        if len(postings) == 1:
+            return iter(postings[0].values())
+        merged = heapq.merge(*(entries.values() for entries in postings), key=lambda book: book.book_id)
+        if by_year:
+            return merged
+        seen = set()
+        return (book for book in merged if not (book.book_id in seen or seen.add(book.book_id)))
+
+    def _candidates(self, where: Predicate) -> Optional[Tuple[List[Mapping[int, Book]], bool]]:
+        """
+        Метод, выбирающий по индексам кандидатов для условия запроса.
+
+        :param where: условие запроса
+        :return: tuple из списков вхождений, содержащих все книги, которые могут
+            удовлетворять условию, и признака того, что это вхождения различных
+            годов по возрастанию, или None, если индекс не подходит
+        """
+        if isinstance(where, Eq):
+            match where.field:
+                case 'title':
+                    return [self._title_index.get(where.value, {})], False
+                case 'author':
+                    return [self._author_index.get(where.value, {})], False
+                case 'year':
+                    return [self._year_index.get(where.value, {})], True
+                case 'id':
+                    book = self._index.get(where.value)
+                    return [{book.book_id: book} if book is not None else {}], False
+        elif isinstance(where, Range) and where.field == 'year':
+            start = 0 if where.low is None else bisect_left(self._years, where.low)
+            stop = len(self._years) if where.high is None else bisect_right(self._years, where.high)
+            return [self._year_index[year] for year in self._years[start:stop]], True
+        elif isinstance(where, And):
+            options = [option for option in map(self._candidates, where.predicates) if option is not None]
+            if options:
+                return min(options, key=lambda option: sum(map(len, option[0])))
+        elif isinstance(where, Or) and where.predicates:
+            options = [self._candidates(predicate) for predicate in where.predicates]
+            if all(option is not None for option in options):
+                return [entries for option in options for entries in option[0]], False
+        return None
+
+    def cache_info(self) -> dict:
+        """
+        Метод, возвращающий состояние кэша результатов поиска.
+
+        :return: dict, количество попаданий и промахов, текущий и наибольший размер
+            или пустой словарь, если кэш отключен
+        """
+        return self._cache.info() if self._cache is not None else {}
+
+    @_reading
+    def get_book(self, book_id: int) -> Optional[Book]:
+        """
+        Метод, возвращающий книгу по id.
+
+        :param book_id: int, id книги
+        :return: Book или None, если книга не найдена
+        """
+        return self._lookup(book_id)
+
+    def _lookup(self, book_id: int) -> Optional[Book]:
+        """
+        Метод, находящий книгу по id в индексе или, пока каталог не загружен, в хранилище.
+
+        Книга, полученная запросом к хранилищу, является отдельным объектом:
+        ее изменения сохраняются только записями, переданными хранилищу.
+
+        :param book_id: int, id книги
+        :return: Book или None, если книга не найдена
+        """
+        if not self._resident:
+            return self.storage.get(book_id)
+        self._require(book_id)
+        return self._index.get(book_id)
+
+    @_writing
     def update_book_status(self, book_id: int, new_book_status: str) -> bool:
         """
         Метод, изменяющий статус книги.
@@ -132,9 +965,171 @@ class Library:
         :param new_book_status: str, новый статус книги
         :return: bool, True если книга была найдена и статус был изменен, False если не найдена
         """
-        for book in self._books:
-            if book.book_id == book_id:
-                book.status = new_book_status
-                self.save_books()
-                return True
-        return False
+        book = self._lookup(book_id)
+        if book is None:
+            return False
+        self._evict(book)
+        self._set_status(book, new_book_status)
+        self._evict(book)
+        self._persist({'op': 'status', 'id': book_id, 'status': new_book_status})
+        return True
+
+    @_writing
+    def update_statuses(self, statuses: Mapping[int, str]) -> int:
+        """
+        Метод, изменяющий статусы нескольких книг с одним сохранением.
+
+        :param statuses: словарь, сопоставляющий id книги с ее новым статусом
+        :return: int, количество найденных книг, статус которых был изменен
+        """
+        self._require(*statuses)
+        records = []
+        for book_id, new_book_status in statuses.items():
+            book = self._lookup(book_id)
+            if book is not None:
+                self._evict(book)
+                self._set_status(book, new_book_status)
+                self._evict(book)
+                records.append({'op': 'status', 'id': book_id, 'status': new_book_status})
+        if records:
+            self._persist(*records)
+        return len(records)
+
+    @_reading
+    def summary(self) -> dict:
+        """
+        Метод, возвращающий сводку по библиотеке.
+
+        Счетчики по статусам, авторам и периодам изменяются при каждом
+        добавлении, удалении и изменении статуса книги, поэтому сводка
+        не требует прохода по книгам. Авторы, написанные в разном регистре,
+        считаются отдельно.
+
+        :return: dict, общее количество книг, количество книг по статусу ("by_status"),
+            по автору ("by_author") и по периоду в YEAR_BUCKET лет ("by_years"),
+            обозначенному первым годом периода
+        """
+        self._require_all()
+        return {
+            'total': len(self._index),
+            'by_status': dict(self._status_counts),
+            'by_author': dict(self._author_counts),
+            'by_years': dict(sorted(self._bucket_counts.items())),
+        }
+
+    def stats(self) -> dict:
+        """
+        Метод, возвращающий снимок метрик библиотеки.
+
+        :return: dict, снимок метрик или пустой словарь, если метрики не собираются
+        """
+        return self.metrics.snapshot() if self.metrics is not None else {}
+
+    def stats_text(self) -> str:
+        """
+        Метод, возвращающий метрики библиотеки в текстовом формате Prometheus.
+
+        :return: str, метрики или пустая строка, если метрики не собираются
+        """
+        return self.metrics.prometheus() if self.metrics is not None else ''
+
+    @contextmanager
+    def transaction(self) -> Iterator['Library']:
+        """
+        Контекстный менеджер транзакции.
+
+        Внутри блока with изменения не сохраняются, а накапливаются и
+        сохраняются один раз при выходе из блока. Если блок завершился
+        исключением или сохранение изменений не удалось, книги, их статусы
+        и следующий id возвращаются к состоянию на начало транзакции,
+        а исключение пробрасывается дальше.
+        Вложенные транзакции входят во внешнюю. В потокобезопасной библиотеке
+        блокировка записи удерживается на протяжении всей транзакции.
+
+        :return: Library, эта же библиотека
+        """
+        if self._lock is None:
+            yield from self._transaction()
+            return
+        with self._write_access():
+            yield from self._transaction()
+
+    def _transaction(self) -> Iterator['Library']:
+        """
+        Генератор, реализующий транзакцию для Library.transaction.
+
+        :return: Library, эта же библиотека
+        """
+        if self._pending is not None:
+            yield self
+            return
+        if not self._resident:  # Накопленные изменения видны только книгам в памяти, а не запросам
+            self._require_all()
+        next_id, max_id = self._next_id, self._max_id
+        self._pending = []
+        self._undo = []
+        try:
+            yield self
+        except BaseException:
+            self._pending = None
+            self._rollback(next_id, max_id)
+            raise
+        records, self._pending = self._pending, None
+        if records:
+            try:
+                self._persist(*records)
+            except BaseException:  # Изменения не сохранены, поэтому не должны оставаться в памяти
+                self._rollback(next_id, max_id)
+                raise
+        self._undo = None
+
+    def _rollback(self, next_id: int, max_id: int):
+        """
+        Метод, отменяющий изменения открытой транзакции по журналу отмены.
+
+        Записи журнала применяются в обратном порядке, поэтому откат
+        стоит пропорционально количеству изменений, а не размеру каталога.
+        Возвращенная удаленная книга ставится на свое место по id во всех
+        индексах; для этого переставляются только книги с большими id.
+
+        :param next_id: int, следующий id книги на начало транзакции
+        :param max_id: int, наибольший id книги на начало транзакции
+        """
+        undo, self._undo = self._undo, None
+        for entry in reversed(undo):
+            match entry:
+                case ('insert', book):
+                    self._remove(book.book_id)
+                case ('remove', book):
+                    self._insert(book)
+                    for postings in (self._index, self._title_index[book.title.lower()],
+                                     self._author_index[book.author.lower()], self._year_index[book.year]):
+                        self._reposition(postings, book.book_id)
+                case ('status', book, status):
+                    self._set_status(book, status)
+                case ('unloaded', shards):
+                    self._unloaded |= shards
+        if undo and self._cache is not None:
+            self._cache.clear()
+        self._next_id = next_id
+        self._max_id = max_id
+
+    @staticmethod
+    def _reposition(postings: Dict[int, Book], book_id: int):
+        """
+        Метод, перемещающий последнюю добавленную книгу на место по возрастанию id.
+
+        Книги с большими id, стоящие в конце словаря, переносятся за нее.
+
+        :param postings: dict, индекс по id или список вхождений вторичного индекса
+        :param book_id: int, id книги, добавленной последней
+        """
+        later = []
+        keys = reversed(postings)
+        next(keys)
+        for key in keys:
+            if key < book_id:
+                break
+            later.append(key)
+        for key in reversed(later):
+            postings[key] = postings.pop(key)
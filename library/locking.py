@@ -0,0 +1,165 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: межпроцессная блокировка недоступна
+    fcntl = None
+
+
+class RWLock:
+    """
+    Класс блокировки чтения-записи
+
+    Любое количество потоков может читать одновременно, запись выполняется
+    монопольно. Ожидающий писатель не пропускает новых читателей, поэтому
+    писатели не голодают. Поток, владеющий записью, может повторно захватывать
+    и запись, и чтение; поток, уже читающий, может повторно захватить чтение.
+    Повышение чтения до записи не поддерживается.
+    """
+
+    def __init__(self):
+        """
+        Конструктор класса RWLock
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def held(self) -> bool:
+        """
+        Метод, проверяющий, удерживает ли текущий поток чтение или запись.
+
+        :return: bool, True если текущий поток удерживает блокировку
+        """
+        return self._writer == threading.get_ident() or getattr(self._local, 'depth', 0) > 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Контекстный менеджер разделяемого доступа на чтение.
+        """
+        if self._writer == threading.get_ident():
+            yield
+            return
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            with self._condition:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+                self._readers += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                with self._condition:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Контекстный менеджер монопольного доступа на запись.
+
+        :raises RuntimeError: если поток пытается писать, удерживая чтение
+        """
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            try:
+                yield
+            finally:
+                self._writer_depth -= 1
+            return
+        if getattr(self._local, 'depth', 0):
+            raise RuntimeError("Нельзя захватить запись, удерживая чтение")
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = None
+                self._condition.notify_all()
+
+
+class FileLock:
+    """
+    Класс межпроцессной блокировки на основе fcntl.flock
+
+    Блокируется отдельный файл рядом с данными, потому что сам файл данных
+    заменяется при сохранении. Блокировка повторно входима внутри процесса.
+    На платформах без fcntl блокировка ничего не делает.
+
+    Attributes:
+        path (str): путь к файлу блокировки
+    """
+
+    def __init__(self, path: str):
+        """
+        Конструктор класса FileLock
+
+        :param path: путь к файлу блокировки
+        """
+        self.path = path
+        self._depth = 0
+        self._file = None
+        self._mutex = threading.RLock()
+
+    @contextmanager
+    def acquire(self, shared: bool = False) -> Iterator[bool]:
+        """
+        Контекстный менеджер захвата блокировки.
+
+        Вложенный захват внутри уже захваченной блокировки не меняет ее режим.
+
+        :param shared: bool, захватить ли разделяемую блокировку вместо монопольной
+        :return: bool, True если это внешний захват, False если вложенный
+        """
+        with self._mutex:
+            outer = self._depth == 0
+            if outer:
+                self._file = open(self.path, 'a+b')
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield outer
+            finally:
+                self._depth -= 1
+                if outer:
+                    if fcntl is not None:
+                        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+                    self._file.close()
+                    self._file = None
+
+
+def file_version(path: str):
+    """
+    Функция, возвращающая версию файла по его метаданным.
+
+    Атомарная замена файла меняет inode, дописывание меняет размер и время
+    изменения, поэтому любое сохранение меняет версию.
+
+    :param path: путь к файлу
+    :return: tuple из inode, размера и времени изменения или None, если файла нет
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
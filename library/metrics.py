@@ -0,0 +1,230 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Optional, Sequence
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                   5.0, 10.0)
+BYTES_BUCKETS = tuple(1 << shift for shift in range(10, 32, 2))
+SCANNED_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def _format_value(value: float) -> str:
+    """
+    Функция, записывающая значение метрики без потери точности.
+
+    :param value: целое число или число с плавающей точкой
+    :return: str, целое число в виде str, число с плавающей точкой в виде repr
+    """
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class Histogram:
+    """
+    Класс гистограммы наблюдаемых значений
+
+    Attributes:
+        buckets (tuple): верхние границы интервалов по возрастанию
+        counts (list): количество значений в каждом интервале и сверх последней границы
+        count (int): количество наблюдений
+        sum (float): сумма наблюдаемых значений
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Конструктор класса Histogram
+
+        :param buckets: верхние границы интервалов по возрастанию
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value: float):
+        """
+        Метод, добавляющий наблюдение в гистограмму.
+
+        :param value: наблюдаемое значение
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> Dict[str, int]:
+        """
+        Метод, возвращающий накопленные количества по границам интервалов.
+
+        :return: dict, количество значений не больше каждой границы; граница '+Inf' включает все значения
+        """
+        result = {}
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result[_format_value(bound)] = total
+        result['+Inf'] = self.count
+        return result
+
+    def snapshot(self) -> dict:
+        """
+        Метод, возвращающий состояние гистограммы.
+
+        :return: dict, количество, сумма и накопленные количества по границам
+        """
+        return {'count': self.count, 'sum': self.sum, 'buckets': self.cumulative()}
+
+
+class Metrics:
+    """
+    Класс метрик операций библиотеки
+
+    Для каждой операции считается количество вызовов и гистограмма времени
+    выполнения. Отдельно собираются гистограммы количества байт, записанных
+    за одно сохранение, и количества книг, просмотренных за один поиск.
+    Если задан profile_every, каждый profile_every-й вызов операции
+    выполняется под cProfile, и статистика профилировщика накапливается.
+
+    Attributes:
+        calls (dict): количество вызовов каждой операции
+        latency (dict): гистограммы времени выполнения каждой операции в секундах
+        bytes_written (Histogram): байты, записанные за одно сохранение
+        books_scanned (Histogram): книги, просмотренные за один поиск
+        profile_every (int): каждый какой вызов профилировать; 0 - не профилировать
+        profiler (cProfile.Profile): профилировщик или None
+    """
+
+    def __init__(self, profile_every: int = 0):
+        """
+        Конструктор класса Metrics
+
+        :param profile_every: int, профилировать каждый profile_every-й вызов операции; 0 - не профилировать
+        """
+        self.calls: Dict[str, int] = {}
+        self.latency: Dict[str, Histogram] = {}
+        self.bytes_written = Histogram(BYTES_BUCKETS)
+        self.books_scanned = Histogram(SCANNED_BUCKETS)
+        self.profile_every = profile_every
+        self.profiler = cProfile.Profile() if profile_every else None
+        self._profiling = False
+        self._lock = threading.Lock()
+
+    def call(self, name: str, function: Callable, *args, **kwargs):
+        """
+        Метод, вызывающий функцию и учитывающий вызов как операцию name.
+
+        Вложенные операции профилируются в составе внешней.
+
+        :param name: str, имя операции
+        :param function: вызываемая функция
+        :param args: позиционные аргументы функции
+        :param kwargs: именованные аргументы функции
+        :return: результат функции
+        """
+        with self._lock:
+            count = self.calls[name] = self.calls.get(name, 0) + 1
+            profile = self.profiler is not None and not self._profiling and count % self.profile_every == 0
+            if profile:
+                self._profiling = True
+        start = time.perf_counter()
+        try:
+            if profile:
+                return self.profiler.runcall(function, *args, **kwargs)
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                if profile:
+                    self._profiling = False
+                histogram = self.latency.get(name)
+                if histogram is None:
+                    histogram = self.latency[name] = Histogram(LATENCY_BUCKETS)
+                histogram.observe(elapsed)
+
+    def record_bytes(self, written: int):
+        """
+        Метод, учитывающий количество байт, записанных за одно сохранение.
+
+        :param written: int, количество байт
+        """
+        with self._lock:
+            self.bytes_written.observe(written)
+
+    def record_scanned(self, scanned: int):
+        """
+        Метод, учитывающий количество книг, просмотренных за один поиск.
+
+        :param scanned: int, количество книг
+        """
+        with self._lock:
+            self.books_scanned.observe(scanned)
+
+    def snapshot(self) -> dict:
+        """
+        Метод, возвращающий копию текущих значений метрик.
+
+        :return: dict, вызовы, гистограммы времени операций, записанных байт и просмотренных книг
+        """
+        with self._lock:
+            return {
+                'calls': dict(self.calls),
+                'latency_seconds': {name: histogram.snapshot() for name, histogram in self.latency.items()},
+                'bytes_written': self.bytes_written.snapshot(),
+                'books_scanned': self.books_scanned.snapshot(),
+            }
+
+    def prometheus(self, prefix: str = 'library') -> str:
+        """
+        Метод, возвращающий метрики в текстовом формате Prometheus.
+
+        :param prefix: str, префикс имен метрик
+        :return: str, метрики в текстовом формате Prometheus
+        """
+        snapshot = self.snapshot()
+        lines = [f'# TYPE {prefix}_calls_total counter']
+        for name, count in sorted(snapshot['calls'].items()):
+            lines.append(f'{prefix}_calls_total{{operation="{name}"}} {count}')
+        lines.append(f'# TYPE {prefix}_latency_seconds histogram')
+        for name, histogram in sorted(snapshot['latency_seconds'].items()):
+            lines.extend(self._histogram_lines(f'{prefix}_latency_seconds', histogram, f'operation="{name}",'))
+        for metric in ('bytes_written', 'books_scanned'):
+            lines.append(f'# TYPE {prefix}_{metric} histogram')
+            lines.extend(self._histogram_lines(f'{prefix}_{metric}', snapshot[metric]))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _histogram_lines(name: str, histogram: dict, labels: str = '') -> list:
+        """
+        Метод, возвращающий строки гистограммы в текстовом формате Prometheus.
+
+        :param name: str, имя метрики
+        :param histogram: dict, состояние гистограммы из Histogram.snapshot
+        :param labels: str, метки гистограммы с завершающей запятой
+        :return: list[str], строки гистограммы
+        """
+        lines = [f'{name}_bucket{{{labels}le="{bound}"}} {count}' for bound, count in histogram['buckets'].items()]
+        suffix = f'{{{labels.rstrip(",")}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {_format_value(histogram["sum"])}')
+        lines.append(f'{name}_count{suffix} {histogram["count"]}')
+        return lines
+
+    def profile_stats(self, sort: str = 'cumulative', limit: int = 20) -> Optional[str]:
+        """
+        Метод, возвращающий накопленную статистику профилировщика.
+
+        :param sort: str, ключ сортировки pstats
+        :param limit: int, количество выводимых функций
+        :return: str, отчет pstats или None, если профилирование отключено или не выполнялось
+        """
+        if self.profiler is None:
+            return None
+        output = io.StringIO()
+        with self._lock:
+            try:
+                stats = pstats.Stats(self.profiler, stream=output)
+            except TypeError:  # профилировщик еще не запускался
+                return None
+            stats.sort_stats(sort).print_stats(limit)
+        return output.getvalue()
@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, Set
+
+
+class TrigramIndex:
+    """
+    Класс инвертированного индекса триграмм
+
+    Индекс хранит для каждой триграммы множество строк (ключей), в которых
+    она встречается. Ключами являются различные названия или авторы в нижнем
+    регистре, поэтому размер индекса зависит от числа различных строк,
+    а не от числа книг.
+
+    Attributes:
+        _postings (dict): множества ключей, индексированные триграммой
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        """
+        Конструктор класса TrigramIndex
+
+        :param keys: ключи, добавляемые в индекс
+        """
+        self._postings: Dict[str, Set[str]] = {}
+        for key in keys:
+            self.add(key)
+
+    @staticmethod
+    def trigrams(text: str) -> Set[str]:
+        """
+        Метод, возвращающий множество триграмм строки.
+
+        :param text: строка
+        :return: set[str], триграммы строки; пустое множество для строк короче трех символов
+        """
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, key: str):
+        """
+        Метод, добавляющий ключ в индекс.
+
+        :param key: ключ
+        """
+        for gram in self.trigrams(key):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: str):
+        """
+        Метод, удаляющий ключ из индекса.
+
+        :param key: ключ
+        """
+        for gram in self.trigrams(key):
+            postings = self._postings[gram]
+            postings.discard(key)
+            if not postings:
+                del self._postings[gram]
+
+    def candidates(self, query: str) -> Set[str]:
+        """
+        Метод, возвращающий ключи, содержащие все триграммы запроса.
+
+        Множества пересекаются начиная с самого короткого. Результат является
+        надмножеством ключей, содержащих запрос как подстроку.
+
+        :param query: запрос длиной не менее трех символов
+        :return: set[str], ключи-кандидаты
+        """
+        postings = sorted((self._postings.get(gram, set()) for gram in self.trigrams(query)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        return postings[0].intersection(*postings[1:])
+
+    def similar(self, query: str, threshold: float) -> Dict[str, float]:
+        """
+        Метод, возвращающий ключи, содержащие достаточную долю триграмм запроса.
+
+        Опечатка портит не более трех триграмм, поэтому ключ с опечаткой
+        относительно запроса сохраняет большую часть общих триграмм.
+
+        :param query: запрос длиной не менее трех символов
+        :param threshold: минимальная доля триграмм запроса, найденных в ключе
+        :return: dict, доля общих триграмм для каждого подходящего ключа
+        """
+        grams = self.trigrams(query)
+        counts: Dict[str, int] = {}
+        for gram in grams:
+            for key in self._postings.get(gram, ()):
+                counts[key] = counts.get(key, 0) + 1
+        return {key: count / len(grams) for key, count in counts.items() if count / len(grams) >= threshold}
@@ -0,0 +1,199 @@
+from operator import attrgetter
+from book.book import Book
+from typing import Callable, Tuple
+
+FIELDS = {'id': 'book_id', 'title': 'title', 'author': 'author', 'year': 'year', 'status': 'status'}
+
+
+def normalize(field: str, value):
+    """
+    Функция, приводящая значение поля к виду, в котором оно сравнивается.
+
+    Строки сравниваются без учета регистра, id и год как целые числа.
+
+    :param field: str, поле книги: 'id', 'title', 'author', 'year' или 'status'
+    :param value: значение поля
+    :return: значение для сравнения
+    """
+    if field in ('id', 'year'):
+        return int(value)
+    return value.lower()
+
+
+def _check_field(field: str):
+    """
+    Функция, проверяющая, что по полю можно строить условия и упорядочивать книги.
+
+    :param field: str, поле книги
+    :raises ValueError: если поле неизвестно
+    """
+    if field not in FIELDS:
+        raise ValueError(f"Неизвестное поле: {field}")
+
+
+def sort_key(order_by: str) -> Tuple[str, bool, Callable[[Book], tuple]]:
+    """
+    Функция, разбирающая поле упорядочивания.
+
+    При равных значениях поля книги упорядочиваются по id в обоих направлениях.
+
+    :param order_by: str, поле книги; с префиксом '-' - по убыванию
+    :return: tuple из поля, признака убывания и ключа сортировки для heapq.nsmallest
+        (по возрастанию) или heapq.nlargest (по убыванию)
+    :raises ValueError: если поле неизвестно
+    """
+    descending = order_by.startswith('-')
+    field = order_by.lstrip('-')
+    _check_field(field)
+    attribute = FIELDS[field]
+    get = attrgetter(attribute)
+    if field in ('id', 'year'):
+        value = get
+    else:
+        def value(book):
+            return get(book).lower()
+    if descending:
+        return field, True, lambda book: (value(book), -book.book_id)
+    return field, False, lambda book: (value(book), book.book_id)
+
+
+class Predicate:
+    """
+    Базовый класс условия запроса
+
+    Условия объединяются операторами & и |.
+    """
+
+    def matches(self, book: Book) -> bool:
+        """
+        Метод, проверяющий, удовлетворяет ли книга условию.
+
+        :param book: Book, проверяемая книга
+        :return: bool, True если книга удовлетворяет условию
+        """
+        raise NotImplementedError
+
+    def __and__(self, other: 'Predicate') -> 'And':
+        return And(self, other)
+
+    def __or__(self, other: 'Predicate') -> 'Or':
+        return Or(self, other)
+
+
+class Eq(Predicate):
+    """
+    Класс условия равенства поля значению
+
+    Attributes:
+        field (str): поле книги
+        value: значение поля в виде для сравнения
+    """
+
+    def __init__(self, field: str, value):
+        """
+        Конструктор класса Eq
+
+        :param field: str, поле книги: 'id', 'title', 'author', 'year' или 'status'
+        :param value: значение поля
+        :raises ValueError: если поле неизвестно или id и год не являются целыми числами
+        """
+        _check_field(field)
+        self.field = field
+        self.value = normalize(field, value)
+        self._attribute = FIELDS[field]
+        self._text = field not in ('id', 'year')
+
+    def matches(self, book: Book) -> bool:
+        value = getattr(book, self._attribute)
+        return (value.lower() if self._text else value) == self.value
+
+    def __repr__(self):
+        return f'Eq({self.field!r}, {self.value!r})'
+
+
+class Range(Predicate):
+    """
+    Класс условия попадания поля в диапазон, включая границы
+
+    Attributes:
+        field (str): поле книги
+        low: нижняя граница в виде для сравнения или None
+        high: верхняя граница в виде для сравнения или None
+    """
+
+    def __init__(self, field: str, low=None, high=None):
+        """
+        Конструктор класса Range
+
+        :param field: str, поле книги: 'id', 'title', 'author', 'year' или 'status'
+        :param low: нижняя граница или None, если диапазон не ограничен снизу
+        :param high: верхняя граница или None, если диапазон не ограничен сверху
+        :raises ValueError: если поле неизвестно или id и год не являются целыми числами
+        """
+        _check_field(field)
+        self.field = field
+        self.low = None if low is None else normalize(field, low)
+        self.high = None if high is None else normalize(field, high)
+        self._attribute = FIELDS[field]
+        self._text = field not in ('id', 'year')
+
+    def matches(self, book: Book) -> bool:
+        value = getattr(book, self._attribute)
+        if self._text:
+            value = value.lower()
+        return (self.low is None or value >= self.low) and (self.high is None or value <= self.high)
+
+    def __repr__(self):
+        return f'Range({self.field!r}, {self.low!r}, {self.high!r})'
+
+
+class And(Predicate):
+    """
+    Класс условия, которому книга удовлетворяет, если удовлетворяет всем вложенным условиям
+
+    Attributes:
+        predicates (tuple): вложенные условия
+    """
+
+    def __init__(self, *predicates: Predicate):
+        """
+        Конструктор класса And
+
+        :param predicates: вложенные условия
+        """
+        self.predicates = predicates
+
+    def matches(self, book: Book) -> bool:
+        for predicate in self.predicates:
+            if not predicate.matches(book):
+                return False
+        return True
+
+    def __repr__(self):
+        return f'And{self.predicates!r}'
+
+
+class Or(Predicate):
+    """
+    Класс условия, которому книга удовлетворяет, если удовлетворяет хотя бы одному вложенному условию
+
+    Attributes:
+        predicates (tuple): вложенные условия
+    """
+
+    def __init__(self, *predicates: Predicate):
+        """
+        Конструктор класса Or
+
+        :param predicates: вложенные условия
+        """
+        self.predicates = predicates
+
+    def matches(self, book: Book) -> bool:
+        for predicate in self.predicates:
+            if predicate.matches(book):
+                return True
+        return False
+
+    def __repr__(self):
+        return f'Or{self.predicates!r}'
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from book.book import Book
+from typing import Iterable, List, Optional, Tuple
+
+MAGIC = b'LIBSNAP\x01'
+HEADER = struct.Struct('<8sQqQQ16s')
+PREFIX_BYTES = 1 << 16
+
+
+def source_signature(file) -> Optional[Tuple[int, int, bytes]]:
+    """
+    Функция, вычисляющая подпись JSON-файла, по которой проверяется снимок.
+
+    Позиция чтения файла не меняется.
+
+    :param file: открытый для чтения файл
+    :return: tuple из размера, времени изменения и хэша первых PREFIX_BYTES байт файла
+        или None, если файл не связан с файловым дескриптором
+    """
+    try:
+        fd = file.fileno()
+        stat = os.fstat(fd)
+        head = os.pread(fd, PREFIX_BYTES, 0)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, hashlib.blake2b(head, digest_size=16).digest()
+
+
+def _columns(books: Iterable[Book]) -> Optional[tuple]:
+    """
+    Функция, раскладывающая книги по столбцам снимка.
+
+    Строки хранятся в общей таблице без повторов и разделяются символом
+    '\\0', поэтому книги со строками, содержащими '\\0', или с нецелыми
+    id и годом в снимок не помещаются.
+
+    :param books: книги
+    :return: tuple из массивов id, годов, номеров строк названия, автора и статуса
+        и списка строк или None, если книги нельзя поместить в снимок
+    """
+    ids, years = array('q'), array('q')
+    titles, authors, statuses = array('I'), array('I'), array('I')
+    strings = {}
+    try:
+        for book in books:
+            ids.append(book.book_id)
+            years.append(book.year)
+            for column, value in ((titles, book.title), (authors, book.author), (statuses, book.status)):
+                number = strings.get(value)
+                if number is None:
+                    if '\0' in value:
+                        return None
+                    number = strings[value] = len(strings)
+                column.append(number)
+    except (TypeError, OverflowError):
+        return None
+    return ids, years, titles, authors, statuses, list(strings)
+
+
+def write_snapshot(path: str, books: Iterable[Book], signature: Tuple[int, int, bytes]) -> bool:
+    """
+    Функция, атомарно записывающая двоичный снимок книг.
+
+    Снимок состоит из заголовка с подписью JSON-файла, пяти массивов
+    фиксированной ширины (id, год, номера строк названия, автора и статуса)
+    и таблицы строк в UTF-8. Ошибки записи не считаются ошибкой сохранения:
+    снимок лишь ускоряет следующую загрузку.
+
+    :param path: путь к файлу снимка
+    :param books: книги
+    :param signature: подпись JSON-файла, из которого получены книги
+    :return: bool, True если снимок записан
+    """
+    columns = _columns(books)
+    if columns is None:
+        return False
+    *arrays, strings = columns
+    blob = '\0'.join(strings).encode('utf-8')
+    size, mtime_ns, digest = signature
+    try:
+        with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(os.path.abspath(path)), delete=False) as file:
+            try:
+                file.write(HEADER.pack(MAGIC, size, mtime_ns, len(arrays[0]), len(strings), digest))
+                for column in arrays:
+                    if sys.byteorder == 'big':
+                        column.byteswap()
+                    column.tofile(file)
+                file.write(blob)
+            except BaseException:
+                file.close()
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, path)
+    except OSError:
+        return False
+    return True
+
+
+def read_snapshot(path: str, signature: Tuple[int, int, bytes]) -> Optional[List[Book]]:
+    """
+    Функция, загружающая книги из двоичного снимка.
+
+    :param path: путь к файлу снимка
+    :param signature: подпись текущего JSON-файла
+    :return: list[Book], книги из снимка или None, если снимка нет,
+        он поврежден или записан для другой версии JSON-файла
+    """
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, size, mtime_ns, count, string_count, digest = HEADER.unpack_from(data)
+        if magic != MAGIC or (size, mtime_ns, digest) != signature:
+            return None
+        offset = HEADER.size
+        columns = []
+        for typecode in 'qqIII':
+            column = array(typecode)
+            end = offset + count * column.itemsize
+            column.frombytes(data[offset:end])
+            if sys.byteorder == 'big':
+                column.byteswap()
+            columns.append(column)
+            offset = end
+        strings = data[offset:].decode('utf-8').split('\0') if string_count else []
+        if len(strings) != string_count or any(len(column) != count for column in columns):
+            return None
+        ids, years, titles, authors, statuses = columns
+        return [Book(book_id, strings[title], strings[author], year, strings[status])
+                for book_id, year, title, author, status in zip(ids, years, titles, authors, statuses)]
+    except (OSError, ValueError, IndexError, struct.error, UnicodeDecodeError):
+        return None
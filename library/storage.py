@@ -0,0 +1,738 @@
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+from bisect import bisect_right
+from book.book import Book
+from library.journal import Journal
+from library.locking import file_version
+from library.snapshot import read_snapshot, source_signature, write_snapshot
+from library.stream import iter_json_array
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+class Storage:
+    """
+    Базовый класс хранилища библиотеки
+
+    Хранилище загружает книги при создании библиотеки и сохраняет ее изменения.
+    Изменения передаются записями того же вида, что и записи журнала:
+    {"op": "add", "book": {...}}, {"op": "delete", "id": ...}
+    или {"op": "status", "id": ..., "status": ...}.
+
+    Хранилище с queryable = True отвечает на поиск и выборку книги по id
+    запросами (методы get, search и max_id), поэтому библиотека загружает
+    его целиком, только когда ей нужен весь каталог.
+    """
+
+    queryable = False
+
+    def load(self) -> List[Book]:
+        """
+        Метод, загружающий список книг из хранилища.
+
+        :return: list[Book], список книг
+        """
+        raise NotImplementedError
+
+    def save(self, books: Iterable[Book]) -> Optional[int]:
+        """
+        Метод, целиком перезаписывающий хранилище.
+
+        :param books: книги библиотеки в порядке добавления
+        :return: int, количество записанных байт или None, если оно неизвестно
+        """
+        raise NotImplementedError
+
+    def version(self):
+        """
+        Метод, возвращающий версию хранилища.
+
+        Версия меняется при каждом сохранении, в том числе другим процессом,
+        и позволяет не загружать книги заново, если хранилище не изменилось.
+        По умолчанию изменения не отслеживаются.
+
+        :return: версия хранилища или None
+        """
+        return None
+
+    def apply(self, records: Sequence[dict], books: Iterable[Book]) -> Optional[int]:
+        """
+        Метод, сохраняющий изменения библиотеки.
+
+        По умолчанию хранилище перезаписывается целиком.
+
+        :param records: записи, описывающие изменения
+        :param books: книги библиотеки после применения изменений
+        :return: int, количество записанных байт или None, если оно неизвестно
+        """
+        return self.save(books)
+
+    def shards(self) -> Optional[List[int]]:
+        """
+        Метод, возвращающий номера разделов, которые можно загружать по отдельности.
+
+        По умолчанию хранилище не разделено и загружается только целиком.
+
+        :return: list[int], номера разделов или None
+        """
+        return None
+
+    def shard_of(self, book_id: int) -> int:
+        """
+        Метод, возвращающий номер раздела, в котором хранится книга.
+
+        :param book_id: int, id книги
+        :return: int, номер раздела
+        """
+        raise NotImplementedError
+
+    def load_shard(self, shard: int) -> List[Book]:
+        """
+        Метод, загружающий книги одного раздела.
+
+        :param shard: int, номер раздела
+        :return: list[Book], книги раздела
+        """
+        raise NotImplementedError
+
+    def get(self, book_id: int) -> Optional[Book]:
+        """
+        Метод, находящий книгу по id запросом к хранилищу.
+
+        :param book_id: int, id книги
+        :return: Book или None, если книга не найдена
+        """
+        raise NotImplementedError
+
+    def search(self, limit: Optional[int] = None, **kwargs) -> List[Book]:
+        """
+        Метод, выполняющий поиск книг на точное совпадение критериев запросом к хранилищу.
+
+        Семантика совпадает с Book.search: названия, авторы и статусы
+        сравниваются без учета регистра, год как целое число.
+
+        :param limit: int, максимальное количество результатов или None
+        :param kwargs: словарь, содержащий поля, по которым производится поиск
+        :return: list[Book], список книг в порядке id
+        """
+        raise NotImplementedError
+
+    def max_id(self) -> int:
+        """
+        Метод, возвращающий наибольший id книги в хранилище.
+
+        :return: int, наибольший id или 0, если хранилище пусто
+        """
+        raise NotImplementedError
+
+
+class JsonStorage(Storage):
+    """
+    Класс хранилища в JSON-файле
+
+    Рядом с файлом хранится двоичный снимок его содержимого. Снимок
+    проверяется по размеру, времени изменения и хэшу начала файла;
+    пока он соответствует файлу, книги загружаются из снимка без разбора JSON.
+
+    Attributes:
+        file_path (str): путь к файлу с данными библиотеки
+        journal (Journal): журнал изменений или None, если журнал отключен
+        snapshot_path (str): путь к двоичному снимку файла или None, если снимок отключен
+    """
+
+    def __init__(self, file_path: str = 'library.json', journal: bool = False, snapshot: bool = True):
+        """
+        Конструктор класса JsonStorage
+
+        :param file_path: путь к файлу с данными библиотеки
+        :param journal: bool, вести ли журнал изменений рядом с файлом вместо
+            перезаписи файла после каждого изменения
+        :param snapshot: bool, хранить ли рядом с файлом двоичный снимок для быстрой загрузки
+        """
+        self.file_path = file_path
+        self.journal = Journal(file_path + '.journal') if journal else None
+        self.snapshot_path = file_path + '.snapshot' if snapshot else None
+
+    def load(self) -> List[Book]:
+        """
+        Метод, загружающий список книг из файла.
+
+        Если снимок соответствует файлу, книги загружаются из снимка.
+        Иначе файл разбирается потоково: каждая книга создается сразу после
+        разбора своего элемента массива, без промежуточного списка словарей,
+        и снимок записывается заново.
+        Если файл пуст или поврежден, возвращается пустой список.
+        Если журнал включен, его записи применяются поверх загруженного файла.
+
+        :return: list[Book], список книг
+        """
+        result = None
+        with open(self.file_path, 'r', encoding='utf-8') as file:
+            signature = source_signature(file) if self.snapshot_path is not None else None
+            if signature is not None:
+                result = read_snapshot(self.snapshot_path, signature)
+            if result is None:
+                result = []
+                try:
+                    for book in iter_json_array(file):
+                        result.append(Book.from_dict(book))
+                except json.JSONDecodeError:
+                    result = []
+                if signature is not None and signature == source_signature(file):
+                    write_snapshot(self.snapshot_path, result, signature)
+        if self.journal is not None:
+            result = self.replay_journal(result)
+        return result
+
+    def version(self):
+        """
+        Метод, возвращающий версию файла и журнала по их метаданным.
+
+        :return: tuple, версии файла и журнала
+        """
+        return file_version(self.file_path), self.journal and file_version(self.journal.path)
+
+    def replay_journal(self, books: List[Book]) -> List[Book]:
+        """
+        Метод, применяющий записи журнала к списку книг.
+
+        Повторное применение записей не меняет результат, поэтому журнал,
+        оставшийся после прерванного уплотнения, можно безопасно применить еще раз.
+
+        :param books: list[Book], список книг из основного файла
+        :return: list[Book], список книг с примененными изменениями
+        """
+        result = {book.book_id: book for book in books}
+        for record in self.journal.replay():
+            match record['op']:
+                case 'add':
+                    book = Book.from_dict(record['book'])
+                    result[book.book_id] = book
+                case 'delete':
+                    result.pop(record['id'], None)
+                case 'status':
+                    if record['id'] in result:
+                        result[record['id']].status = record['status']
+        return list(result.values())
+
+    def save(self, books: Iterable[Book]) -> int:
+        """
+        Метод, сохраняющий список книг в файл
+
+        Метод проходит по списку книг, создает из них словари,
+        и сохраняет их во временный файл, который затем атомарно
+        заменяет файл, указанный в self.file_path. Если журнал включен,
+        после замены файла журнал очищается. Снимок записывается заново,
+        чтобы следующая загрузка не разбирала JSON.
+
+        :param books: книги библиотеки в порядке добавления
+        :return: int, размер записанного файла в байтах
+        """
+        books = list(books)
+        result = [book.to_dict() for book in books]
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        try:
+            mode = os.stat(self.file_path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        with tempfile.NamedTemporaryFile('w+', encoding='utf-8', dir=directory, delete=False) as file:
+            try:
+                json.dump(result, file, ensure_ascii=False, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+                os.chmod(file.name, mode)
+                written = file.tell()
+                signature = source_signature(file)
+            except BaseException:
+                file.close()
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, self.file_path)
+        if self.snapshot_path is not None and signature is not None:
+            write_snapshot(self.snapshot_path, books, signature)
+        if self.journal is not None:
+            self.journal.clear()
+        return written
+
+    def apply(self, records: Sequence[dict], books: Iterable[Book]) -> int:
+        """
+        Метод, сохраняющий изменения библиотеки.
+
+        Без журнала файл перезаписывается целиком. С журналом записи
+        дописываются в журнал, а файл перезаписывается только когда журнал
+        превышает заданный порог.
+
+        :param records: записи, описывающие изменения
+        :param books: книги библиотеки после применения изменений
+        :return: int, количество записанных байт
+        """
+        if self.journal is None:
+            return self.save(books)
+        written = self.journal.append(records)
+        if self.journal.needs_compaction():
+            written += self.save(books)
+        return written
+
+
+class SqliteStorage(Storage):
+    """
+    Класс хранилища в базе данных SQLite
+
+    Каждое изменение библиотеки выполняется отдельным запросом к одной строке.
+    Название, автор и статус дополнительно хранятся в нижнем регистре в
+    индексированных столбцах, поэтому поиск выполняется запросом по индексу
+    без загрузки книг в память.
+
+    Attributes:
+        db_path (str): путь к файлу базы данных
+        connection (sqlite3.Connection): соединение с базой данных
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS books (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            title_key TEXT NOT NULL,
+            author TEXT NOT NULL,
+            author_key TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            status_key TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS books_title_key ON books (title_key);
+        CREATE INDEX IF NOT EXISTS books_author_key ON books (author_key);
+        CREATE INDEX IF NOT EXISTS books_year ON books (year);
+        CREATE INDEX IF NOT EXISTS books_status_key ON books (status_key);
+    """
+    INSERT = 'INSERT OR REPLACE INTO books VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+    SELECT = 'SELECT id, title, author, year, status FROM books'
+    queryable = True
+
+    def __init__(self, db_path: str = 'library.db'):
+        """
+        Конструктор класса SqliteStorage
+
+        :param db_path: путь к файлу базы данных
+        """
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.executescript(self.SCHEMA)
+
+    @staticmethod
+    def _row(book: dict) -> tuple:
+        """
+        Метод, преобразующий словарь книги в строку таблицы.
+
+        :param book: словарь с полями книги в формате файла library.json
+        :return: tuple, строка таблицы books
+        """
+        return (book['id'], book['title'], book['title'].lower(), book['author'],
+                book['author'].lower(), book['year'], book['status'], book['status'].lower())
+
+    def version(self):
+        """
+        Метод, возвращающий версию базы данных.
+
+        PRAGMA data_version меняется, когда базу изменяет другое соединение.
+
+        :return: int, версия базы данных
+        """
+        return self.connection.execute('PRAGMA data_version').fetchone()[0]
+
+    def load(self) -> List[Book]:
+        """
+        Метод, загружающий список книг из базы данных.
+
+        :return: list[Book], список книг в порядке id
+        """
+        cursor = self.connection.execute(self.SELECT + ' ORDER BY id')
+        return [Book(*row) for row in cursor]
+
+    def save(self, books: Iterable[Book]):
+        """
+        Метод, целиком перезаписывающий таблицу книг в одной транзакции.
+
+        :param books: книги библиотеки
+        """
+        with self.connection:
+            self.connection.execute('DELETE FROM books')
+            self.connection.executemany(self.INSERT, (self._row(book.to_dict()) for book in books))
+
+    def apply(self, records: Sequence[dict], books: Iterable[Book]):
+        """
+        Метод, выполняющий изменения однострочными запросами в одной транзакции.
+
+        :param records: записи, описывающие изменения
+        :param books: книги библиотеки после применения изменений (не используются)
+        """
+        with self.connection:
+            for record in records:
+                match record['op']:
+                    case 'add':
+                        self.connection.execute(self.INSERT, self._row(record['book']))
+                    case 'delete':
+                        self.connection.execute('DELETE FROM books WHERE id = ?', (record['id'],))
+                    case 'status':
+                        self.connection.execute('UPDATE books SET status = ?, status_key = ? WHERE id = ?',
+                                                (record['status'], record['status'].lower(), record['id']))
+
+    def get(self, book_id: int) -> Optional[Book]:
+        """
+        Метод, находящий книгу по первичному ключу.
+
+        :param book_id: int, id книги
+        :return: Book или None, если книга не найдена
+        """
+        row = self.connection.execute(self.SELECT + ' WHERE id = ?', (book_id,)).fetchone()
+        return Book(*row) if row is not None else None
+
+    def search(self, limit: Optional[int] = None, **kwargs) -> List[Book]:
+        """
+        Метод, выполняющий поиск книг запросом по индексированным столбцам.
+
+        :param limit: int, максимальное количество результатов или None
+        :param kwargs: словарь, содержащий поля, по которым производится поиск
+        :return: list[Book], список книг в порядке id
+        :raises AttributeError: если поле неизвестно
+        """
+        if all(value is None for value in kwargs.values()):  # Проверка на пустой словарь
+            return []
+        conditions = []
+        params = []
+        for key, value in kwargs.items():
+            if value is None:
+                continue
+            match key:
+                case 'title' | 'author' | 'status':
+                    conditions.append(f'{key}_key = ?')
+                    params.append(value.lower())
+                case 'year':
+                    conditions.append('year = ?')
+                    params.append(int(value))
+                case 'id':  # Book.search не находит книги по полю id
+                    return []
+                case _:
+                    raise AttributeError(key)
+        sql = self.SELECT + ' WHERE ' + ' AND '.join(conditions) + ' ORDER BY id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [Book(*row) for row in self.connection.execute(sql, params)]
+
+    def max_id(self) -> int:
+        """
+        Метод, возвращающий наибольший id книги в базе данных.
+
+        :return: int, наибольший id или 0, если база данных пуста
+        """
+        return self.connection.execute('SELECT COALESCE(MAX(id), 0) FROM books').fetchone()[0]
+
+    def close(self):
+        """
+        Метод, закрывающий соединение с базой данных.
+        """
+        self.connection.close()
+
+
+class ShardedStorage(Storage):
+    """
+    Класс хранилища в каталоге JSON-файлов, разделенного по диапазонам id
+
+    Раздел i хранит книги с id от starts[i] до starts[i + 1]. Id не меньше
+    последней границы делятся на разделы по shard_size подряд идущих id,
+    поэтому растущий каталог сам занимает новые разделы. Изменение
+    перезаписывает только затронутые им разделы, а разделы загружаются
+    по отдельности, когда они нужны.
+
+    Файлы разделов лежат в подкаталоге поколения, на которое указывает
+    манифест. Перераспределение записывает новое поколение и атомарно
+    заменяет манифест, поэтому прерванное перераспределение не портит данные.
+
+    Attributes:
+        directory (str): каталог хранилища
+        shard_size (int): количество id в разделе за последней границей
+        starts (list): отсортированные нижние границы id разделов
+        generation (int): номер текущего поколения файлов разделов
+        _shards (dict): книги загруженных разделов по номеру раздела и id
+    """
+
+    MANIFEST = 'manifest.json'
+    SHARD_NAME = re.compile(r'shard-(\d+)\.json$')
+
+    def __init__(self, directory: str = 'library.shards', shard_size: int = 10000):
+        """
+        Конструктор класса ShardedStorage
+
+        Если каталог еще не создан, создается пустое хранилище.
+
+        :param directory: каталог хранилища
+        :param shard_size: int, количество id в разделе для нового хранилища
+        """
+        if shard_size < 1:
+            raise ValueError("Размер раздела должен быть положительным")
+        self.directory = directory
+        self.shard_size = shard_size
+        self.starts = [0]
+        self.generation = 0
+        self._shards: Dict[int, Dict[int, Book]] = {}
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self._manifest_path()):
+            self._read_manifest()
+        else:
+            self._write_manifest()
+
+    def _manifest_path(self) -> str:
+        """
+        Метод, возвращающий путь к манифесту.
+
+        :return: str, путь к манифесту
+        """
+        return os.path.join(self.directory, self.MANIFEST)
+
+    def _generation_path(self, generation: Optional[int] = None) -> str:
+        """
+        Метод, возвращающий путь к каталогу поколения.
+
+        :param generation: int, номер поколения; по умолчанию текущее
+        :return: str, путь к каталогу поколения
+        """
+        return os.path.join(self.directory, f'gen-{self.generation if generation is None else generation:06d}')
+
+    def _shard_path(self, shard: int) -> str:
+        """
+        Метод, возвращающий путь к файлу раздела текущего поколения.
+
+        :param shard: int, номер раздела
+        :return: str, путь к файлу раздела
+        """
+        return os.path.join(self._generation_path(), f'shard-{shard:06d}.json')
+
+    def _read_manifest(self):
+        """
+        Метод, читающий границы разделов и номер поколения из манифеста.
+        """
+        with open(self._manifest_path(), 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+        self.generation = manifest['generation']
+        self.shard_size = manifest['shard_size']
+        self.starts = manifest['starts']
+
+    def _write_manifest(self):
+        """
+        Метод, атомарно заменяющий манифест.
+        """
+        manifest = {'generation': self.generation, 'shard_size': self.shard_size, 'starts': self.starts}
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.directory, delete=False) as file:
+            try:
+                json.dump(manifest, file)
+                file.flush()
+                os.fsync(file.fileno())
+            except BaseException:
+                file.close()
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, self._manifest_path())
+
+    def shard_of(self, book_id: int) -> int:
+        """
+        Метод, возвращающий номер раздела, в котором хранится книга.
+
+        :param book_id: int, id книги
+        :return: int, номер раздела
+        """
+        index = max(bisect_right(self.starts, book_id) - 1, 0)
+        if index < len(self.starts) - 1:
+            return index
+        return index + (book_id - self.starts[-1]) // self.shard_size
+
+    def shards(self) -> List[int]:
+        """
+        Метод, возвращающий номера непустых разделов текущего поколения.
+
+        :return: list[int], номера разделов по возрастанию
+        """
+        try:
+            names = os.listdir(self._generation_path())
+        except FileNotFoundError:
+            return []
+        return sorted(int(match.group(1)) for match in map(self.SHARD_NAME.match, names) if match)
+
+    def _members(self, shard: int) -> Dict[int, Book]:
+        """
+        Метод, возвращающий книги раздела по id и загружающий раздел при первом обращении.
+
+        :param shard: int, номер раздела
+        :return: dict, книги раздела по id
+        """
+        books = self._shards.get(shard)
+        if books is None:
+            path = self._shard_path(shard)
+            loaded = JsonStorage(path).load() if os.path.exists(path) else []
+            books = self._shards[shard] = {book.book_id: book for book in loaded}
+        return books
+
+    def load_shard(self, shard: int) -> List[Book]:
+        """
+        Метод, загружающий книги одного раздела.
+
+        :param shard: int, номер раздела
+        :return: list[Book], книги раздела в порядке добавления
+        """
+        return list(self._members(shard).values())
+
+    def load(self) -> List[Book]:
+        """
+        Метод, загружающий книги всех разделов.
+
+        Манифест перечитывается, поэтому учитывается перераспределение,
+        выполненное другим процессом.
+
+        :return: list[Book], список книг в порядке разделов
+        """
+        self._read_manifest()
+        self._shards = {}
+        result = []
+        for shard in self.shards():
+            result.extend(self.load_shard(shard))
+        return result
+
+    def version(self):
+        """
+        Метод, возвращающий версию манифеста и файлов разделов по их метаданным.
+
+        :return: tuple, версии манифеста и файлов разделов
+        """
+        try:
+            names = sorted(os.listdir(self._generation_path()))
+        except FileNotFoundError:
+            names = []
+        return file_version(self._manifest_path()), tuple(
+            (name, file_version(os.path.join(self._generation_path(), name))) for name in names)
+
+    def _write(self, shard: int) -> int:
+        """
+        Метод, атомарно перезаписывающий файл раздела; файл пустого раздела удаляется.
+
+        :param shard: int, номер раздела
+        :return: int, количество записанных байт
+        """
+        path = self._shard_path(shard)
+        books = self._shards.get(shard)
+        if books:
+            os.makedirs(self._generation_path(), exist_ok=True)
+            return JsonStorage(path).save(books.values())
+        for name in (path, path + '.snapshot'):
+            try:
+                os.unlink(name)
+            except FileNotFoundError:
+                pass
+        return 0
+
+    def save(self, books: Iterable[Book]) -> int:
+        """
+        Метод, целиком перезаписывающий все разделы.
+
+        :param books: книги библиотеки в порядке добавления
+        :return: int, количество записанных байт
+        """
+        stale = self.shards()
+        self._shards = {}
+        for book in books:
+            self._shards.setdefault(self.shard_of(book.book_id), {})[book.book_id] = book
+        return sum(self._write(shard) for shard in sorted(set(stale) | self._shards.keys()))
+
+    def apply(self, records: Sequence[dict], books: Iterable[Book]) -> int:
+        """
+        Метод, применяющий изменения к книгам разделов и перезаписывающий только затронутые разделы.
+
+        Разделы, которые еще не загружены, загружаются перед изменением.
+
+        :param records: записи, описывающие изменения
+        :param books: книги библиотеки после применения изменений (не используются)
+        :return: int, количество записанных байт
+        """
+        dirty = set()
+        for record in records:
+            match record['op']:
+                case 'add':
+                    book = Book.from_dict(record['book'])
+                    shard = self.shard_of(book.book_id)
+                    self._members(shard)[book.book_id] = book
+                case 'delete':
+                    shard = self.shard_of(record['id'])
+                    self._members(shard).pop(record['id'], None)
+                case 'status':
+                    shard = self.shard_of(record['id'])
+                    book = self._members(shard).get(record['id'])
+                    if book is not None:
+                        book.status = record['status']
+                case _:
+                    continue
+            dirty.add(shard)
+        return sum(self._write(shard) for shard in sorted(dirty))
+
+    def rebalance(self, shard_size: Optional[int] = None) -> int:
+        """
+        Метод, заново распределяющий книги по разделам одинакового размера.
+
+        Границы выбираются так, чтобы в каждом разделе, кроме последних,
+        было shard_size книг: разделы, опустевшие после удалений, объединяются,
+        а новые id снова делятся на разделы по shard_size. Книги записываются
+        в новое поколение, затем манифест атомарно заменяется и старое
+        поколение удаляется. Другие процессы не должны изменять хранилище
+        во время перераспределения.
+
+        :param shard_size: int, количество книг в разделе; по умолчанию текущее
+        :return: int, количество разделов после перераспределения
+        """
+        if shard_size is not None and shard_size < 1:
+            raise ValueError("Размер раздела должен быть положительным")
+        books = sorted(self.load(), key=lambda book: book.book_id)
+        if shard_size is not None:
+            self.shard_size = shard_size
+        previous = self.generation
+        self.generation += 1
+        shutil.rmtree(self._generation_path(), ignore_errors=True)  # Остатки прерванного перераспределения
+        self.starts = [0] + [books[index].book_id for index in range(self.shard_size, len(books), self.shard_size)]
+        self._shards = {}
+        for book in books:
+            self._shards.setdefault(self.shard_of(book.book_id), {})[book.book_id] = book
+        for shard in self._shards:
+            self._write(shard)
+        self._write_manifest()
+        shutil.rmtree(self._generation_path(previous), ignore_errors=True)
+        return len(self._shards)
+
+
+def migrate_json_to_shards(json_path: str, directory: str, shard_size: int = 10000) -> int:
+    """
+    Функция, переносящая книги из JSON-файла в каталог разделов.
+
+    :param json_path: путь к файлу library.json
+    :param directory: каталог хранилища разделов
+    :param shard_size: int, количество id в разделе
+    :return: int, количество перенесенных книг
+    """
+    books = JsonStorage(json_path).load()
+    ShardedStorage(directory, shard_size).save(books)
+    return len(books)
+
+
+def migrate_json_to_sqlite(json_path: str, db_path: str) -> int:
+    """
+    Функция, переносящая книги из JSON-файла в базу данных SQLite.
+
+    :param json_path: путь к файлу library.json
+    :param db_path: путь к файлу базы данных
+    :return: int, количество перенесенных книг
+    """
+    books = JsonStorage(json_path).load()
+    storage = SqliteStorage(db_path)
+    try:
+        storage.save(books)
+    finally:
+        storage.close()
+    return len(books)
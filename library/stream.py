@@ -0,0 +1,69 @@
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+_scan = json.JSONDecoder().scan_once
+_start = re.compile(r'[ \t\n\r]*\[[ \t\n\r]*')
+_separator = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+_whitespace = re.compile(r'[ \t\n\r]*')
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_json_array(file: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Функция, последовательно разбирающая JSON-массив верхнего уровня из файла.
+
+    Файл читается блоками по chunk_size символов, и каждый элемент массива
+    возвращается сразу после разбора, поэтому в памяти одновременно
+    находится только текущий блок и текущий элемент.
+
+    :param file: текстовый файл, содержащий JSON-массив
+    :param chunk_size: размер читаемого блока в символах
+    :return: итератор элементов массива
+    :raises json.JSONDecodeError: если файл пуст или не является JSON-массивом
+    """
+    buffer = ''
+    eof = False
+    while True:
+        match = _start.match(buffer)
+        if match is not None:
+            break
+        if eof or buffer.strip(_WHITESPACE):
+            raise json.JSONDecodeError('Expecting array', buffer, 0)
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+    pos = match.end()
+    first = True
+    while True:
+        if first and buffer.startswith(']', pos):
+            pos += 1
+            break
+        try:
+            value, end = _scan(buffer, pos)
+            match = _separator.match(buffer, end)
+            # Элемент или разделитель на границе буфера может продолжаться в следующем блоке
+            complete = match is not None and (match.end() < len(buffer) or eof)
+        except (StopIteration, json.JSONDecodeError):
+            complete = False
+        if not complete:
+            if eof:
+                raise json.JSONDecodeError('Invalid array element', buffer, pos)
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = _whitespace.match(buffer).end()
+            continue
+        pos = match.end()
+        first = False
+        yield value
+        if match.group(1) == ']':
+            break
+    rest = buffer[pos:]
+    while True:
+        if rest.strip(_WHITESPACE):
+            raise json.JSONDecodeError('Extra data', buffer, pos)
+        if eof:
+            break
+        rest = file.read(chunk_size)
+        eof = not rest
@@ -1,7 +1,18 @@
+import argparse
+import heapq
+import json
 import sys
-from datetime import date
+import time
 from os.path import exists
-from library.library import Library
+from typing import Iterable, List, Optional, TextIO
+from book.book import Book, validate_book
+from library.exporter import export_books
+from library.importer import import_books
+from library.library import YEAR_BUCKET, Library
+from library.storage import ShardedStorage, SqliteStorage, migrate_json_to_shards, migrate_json_to_sqlite
+
+
+SORT_KEYS = ('id', 'title', 'author', 'year', 'status')
 
 
 class IOWorker:
@@ -10,21 +21,80 @@ class IOWorker:
 
     Attributes:
         library (Library): Объект библиотеки.
+        page_size (int): Количество книг на одной странице вывода.
+        sort_key (str): Поле, по которому упорядочивается вывод, или None для порядка добавления.
+        reverse (bool): Выводить ли книги в обратном порядке.
     """
-    def __init__(self, library):
+    def __init__(self, library, page_size: int = 20, sort_key: Optional[str] = None, reverse: bool = False):
         """
         Конструктор класса IOWorker
 
         :param library: Объект библиотеки
+        :param page_size: Количество книг на одной странице вывода
+        :param sort_key: Поле из SORT_KEYS, по которому упорядочивается вывод, или None
+        :param reverse: Выводить ли книги в обратном порядке
         """
         self.library = library
+        self.page_size = page_size
+        self.sort_key = sort_key
+        self.reverse = reverse
+
+    def show_pages(self, books: List[Book]):
+        """
+        Метод, постранично выводящий список книг.
+
+        Книги упорядочиваются по полю self.sort_key. Каждая страница
+        формируется целиком и выводится одной записью в stdout.
+        Если страниц больше одной, после каждой страницы запрашивается
+        переход: 'n' (или пустой ввод) - следующая страница,
+        'p' - предыдущая, 'q' - выход из просмотра.
+
+        :param books: list[Book], список книг
+        :return: None
+        """
+        if self.sort_key is not None:
+            attribute = 'book_id' if self.sort_key == 'id' else self.sort_key
+            books = sorted(books, key=lambda book: self._sort_value(getattr(book, attribute)), reverse=self.reverse)
+        elif self.reverse:
+            books = books[::-1]
+        pages = max(1, -(-len(books) // self.page_size))
+        page = 0
+        while True:
+            start = page * self.page_size
+            text = "".join(f"{book}\n" for book in books[start:start + self.page_size])
+            if pages > 1:
+                text += f"\nСтраница {page + 1} из {pages}\n"
+            sys.stdout.write(text)
+            if pages == 1:
+                return
+            match input("n - следующая страница, p - предыдущая, q - выход: ").strip().lower():
+                case "" | "n" | "т":
+                    if page + 1 == pages:
+                        return
+                    page += 1
+                case "p" | "з":
+                    page = max(page - 1, 0)
+                case _:
+                    return
+
+    @staticmethod
+    def _sort_value(value):
+        """
+        Метод, возвращающий ключ сортировки значения поля книги.
+
+        Строки сравниваются без учета регистра.
+
+        :param value: значение поля книги
+        :return: ключ сортировки
+        """
+        return value.lower() if isinstance(value, str) else value
 
     def add_book(self):
         """
         Метод для добавления книги в библиотеку.
 
         Запрашивает у пользователя название, автора и год издания книги.
-        Проверяет корректность введенного года. Если данные корректны,
+        Проверяет данные книги функцией validate_book. Если данные корректны,
         добавляет книгу в библиотеку и выводит сообщение об успешном добавлении.
         В случае ошибки выводит соответствующее сообщение.
 
@@ -34,8 +104,10 @@ class IOWorker:
             title = input("Введите название книги: ")
             author = input("Введите автора книги: ")
             year = int(input("Введите год издания: "))
-            if year < 0 or date.today().year < year:
-                print("\nГод выпуска книги не корректен\n")
+            try:
+                title, author, year = validate_book(title, author, year)
+            except ValueError as error:
+                print(f"\n{error}\n")
                 return
             self.library.add_book(title, author, year)
             print(f"\nКнига '{title}' "
@@ -85,8 +157,7 @@ class IOWorker:
             }
             result = self.library.search_book(**search_params)
             if result:
-                for book in result:
-                    print(book)
+                self.show_pages(result)
             else:
                 print("\nКниг не найдено\n")
         except AttributeError:
@@ -131,18 +202,234 @@ class IOWorker:
 
         Метод сначала проверяет, не является ли список книг пустым.
         Если он пуст, выводится сообщение об этом.
-        Если в библиотеке есть книги, то они выводятся на экран.
+        Если в библиотеке есть книги, то они выводятся на экран постранично.
 
         :return: None
         """
-        if not self.library.books:
+        books = self.library.books
+        if not books:
             print("\nБиблиотека пуста\n")
             return
-        for book in self.library.books:
-            print(book)
+        self.show_pages(books)
+
+    def show_summary(self, top: int = 10):
+        """
+        Выводит на экран сводку по библиотеке.
+
+        Выводятся общее количество книг, количество книг по статусам и по
+        периодам издания, а также авторы с наибольшим количеством книг.
+
+        :param top: количество выводимых авторов
+        :return: None
+        """
+        summary = self.library.summary()
+        if not summary["total"]:
+            print("\nБиблиотека пуста\n")
+            return
+        lines = [f"\nВсего книг: {summary['total']}", "По статусам:"]
+        lines += [f"  {status}: {count}" for status, count in sorted(summary["by_status"].items())]
+        lines.append("По годам издания:")
+        lines += [f"  {start}-{start + YEAR_BUCKET - 1}: {count}" for start, count in summary["by_years"].items()]
+        lines.append("Авторы с наибольшим количеством книг:")
+        authors = heapq.nlargest(top, summary["by_author"].items(), key=lambda item: item[1])
+        lines += [f"  {author}: {count}" for author, count in authors]
+        print("\n".join(lines) + "\n")
+
+
+class BatchWorker:
+    """
+    Класс пакетного обработчика команд.
+
+    Команды читаются по одной из JSONL-потока, выполняются через объект
+    библиотеки в одной транзакции и сохраняются один раз в конце.
+    Результат каждой команды записывается в выходной поток одной JSON-строкой
+    после того, как изменения сохранены. Если транзакция отменена, вместо
+    результатов команд записывается одна строка с "rolled_back": true.
+
+    Поддерживаемые команды:
+        {"op": "add", "title": ..., "author": ..., "year": ...}
+        {"op": "delete", "id": ...}
+        {"op": "status", "id": ..., "status": ...}
+        {"op": "search", "title": ..., "author": ..., "year": ..., "mode": ..., "limit": ...}
+
+    Attributes:
+        library (Library): Объект библиотеки.
+        output (TextIO): Поток, в который записываются результаты.
+    """
+    def __init__(self, library, output: TextIO):
+        """
+        Конструктор класса BatchWorker
 
+        :param library: Объект библиотеки
+        :param output: Поток, в который записываются результаты
+        """
+        self.library = library
+        self.output = output
+
+    def run(self, lines: Iterable[str]) -> dict:
+        """
+        Метод, выполняющий команды из JSONL-потока.
+
+        Ошибка в отдельной команде не прерывает обработку: ее результат
+        содержит "ok": false и описание ошибки. Результаты накапливаются
+        и записываются только после сохранения изменений. Если сохранить
+        изменения не удалось, все команды считаются ошибочными.
+
+        :param lines: строки JSONL-потока
+        :return: dict, сводка: количество команд, ошибок, отмена пакета, время и скорость обработки
+        """
+        operations = 0
+        errors = 0
+        results = []
+        rolled_back = False
+        start = time.perf_counter()
+        try:
+            with self.library.transaction():
+                for line_number, line in enumerate(lines, start=1):
+                    if not line.strip():
+                        continue
+                    operations += 1
+                    try:
+                        result = self.execute(json.loads(line))
+                    except (AttributeError, KeyError, TypeError, ValueError) as error:
+                        result = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+                    if not result["ok"]:
+                        errors += 1
+                    result["line"] = line_number
+                    results.append(result)
+        except Exception as error:  # Изменения отменены, поэтому результаты команд недействительны
+            rolled_back = True
+            errors = operations
+            results = [{"ok": False, "rolled_back": True, "error": f"{type(error).__name__}: {error}"}]
+        for result in results:
+            self.output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        elapsed = time.perf_counter() - start
+        return {
+            "operations": operations,
+            "errors": errors,
+            "rolled_back": rolled_back,
+            "seconds": round(elapsed, 6),
+            "ops_per_sec": round(operations / elapsed, 1) if elapsed else None,
+        }
+
+    def execute(self, command: dict) -> dict:
+        """
+        Метод, выполняющий одну команду.
+
+        Для команды add действуют те же проверки данных книги, что и в IOWorker.add_book.
+
+        :param command: dict, команда
+        :return: dict, результат выполнения команды
+        """
+        match command["op"]:
+            case "add":
+                try:
+                    title, author, year = validate_book(command["title"], command["author"], command["year"])
+                except ValueError as error:
+                    return {"op": "add", "ok": False, "error": str(error)}
+                self.library.add_book(title, author, year)
+                return {"op": "add", "ok": True, "id": self.library.next_id - 1}
+            case "delete":
+                return {"op": "delete", "ok": self.library.delete_book(int(command["id"])), "id": command["id"]}
+            case "status":
+                new_book_status = command["status"].lower()
+                if new_book_status not in ["в наличии", "выдана"]:
+                    return {"op": "status", "ok": False, "error": "Статус не корректен"}
+                ok = self.library.update_book_status(int(command["id"]), new_book_status)
+                return {"op": "status", "ok": ok, "id": command["id"]}
+            case "search":
+                books = self.library.search_book(
+                    mode=command.get("mode", "exact"), limit=command.get("limit"),
+                    **{key: command.get(key) for key in ("title", "author", "year")})
+                return {"op": "search", "ok": True, "books": [book.to_dict() for book in books]}
+            case op:
+                return {"op": op, "ok": False, "error": "Неизвестная команда"}
+
+
+def open_library(db_path=None, journal: bool = False, shards=None) -> Library:
+    """
+    Функция, создающая объект библиотеки.
 
-def main():
+    :param db_path: путь к базе данных SQLite; если не указан, книги хранятся в library.json
+    :param journal: вести ли журнал изменений рядом с library.json вместо перезаписи файла
+    :param shards: каталог хранилища, разделенного по диапазонам id, используемого вместо library.json
+    :return: Library, объект библиотеки
+    """
+    if db_path is not None:
+        return Library(db_path, storage=SqliteStorage(db_path))
+    if shards is not None:
+        return Library(shards, storage=ShardedStorage(shards))
+    if not exists("library.json"):
+        open("library.json", "w+").close()
+    return Library(journal=journal)
+
+
+def run_batch(path: str, db_path=None, output: TextIO = sys.stdout, shards=None) -> dict:
+    """
+    Функция пакетного режима.
+
+    Выполняет команды из JSONL-файла (или из stdin, если path равен "-"),
+    записывает результаты в output, а сводку с количеством операций
+    в секунду выводит в stderr.
+
+    :param path: путь к JSONL-файлу с командами или "-"
+    :param db_path: путь к базе данных SQLite; если не указан, книги хранятся в library.json
+    :param output: поток, в который записываются результаты
+    :param shards: каталог хранилища, разделенного по диапазонам id
+    :return: dict, сводка выполнения
+    """
+    worker = BatchWorker(open_library(db_path, shards=shards), output)
+    if path == "-":
+        summary = worker.run(sys.stdin)
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            summary = worker.run(file)
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return summary
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Функция, разбирающая аргументы командной строки.
+
+    :param argv: список аргументов; по умолчанию sys.argv[1:]
+    :return: argparse.Namespace, разобранные аргументы
+    """
+    parser = argparse.ArgumentParser(description="Система управления библиотекой")
+    parser.add_argument("--db", help="путь к базе данных SQLite, используемой вместо library.json")
+    parser.add_argument("--shards", metavar="DIR",
+                        help="каталог хранилища, разделенного по диапазонам id, используемого вместо library.json")
+    parser.add_argument("--shard-size", type=int,
+                        help="количество книг в разделе при переносе (по умолчанию 10000) "
+                             "и перераспределении (по умолчанию текущее)")
+    parser.add_argument("--migrate", action="store_true",
+                        help="перенести книги из library.json в базу данных, указанную в --db, "
+                             "или в каталог, указанный в --shards, и выйти")
+    parser.add_argument("--rebalance", action="store_true",
+                        help="заново распределить книги каталога, указанного в --shards, по разделам и выйти")
+    parser.add_argument("--page-size", type=int, default=20, help="количество книг на одной странице вывода")
+    parser.add_argument("--sort", choices=SORT_KEYS, help="поле, по которому упорядочивается вывод книг")
+    parser.add_argument("--reverse", action="store_true", help="выводить книги в обратном порядке")
+    parser.add_argument("--batch", metavar="PATH",
+                        help="выполнить команды из JSONL-файла (или из stdin, если указан '-') и выйти")
+    parser.add_argument("--import", dest="import_path", metavar="PATH",
+                        help="импортировать книги из CSV-, JSONL- или JSON-файла и выйти")
+    parser.add_argument("--export", dest="export_path", metavar="PATH",
+                        help="выгрузить каталог в CSV-, JSONL- или JSON-файл (с расширением .gz - со сжатием) и выйти")
+    parser.add_argument("--report", metavar="PATH", help="файл отчета об отклоненных при импорте строках")
+    parser.add_argument("--workers", type=int, help="количество процессов проверки строк при импорте")
+    args = parser.parse_args(argv)
+    if args.page_size < 1:
+        parser.error("--page-size должен быть положительным")
+    if args.shard_size is not None and args.shard_size < 1:
+        parser.error("--shard-size должен быть положительным")
+    if args.db is not None and args.shards is not None:
+        parser.error("--db и --shards нельзя указывать вместе")
+    return args
+
+
+def main(db_path=None, page_size: int = 20, sort_key: Optional[str] = None, reverse: bool = False,
+         shards=None):
     """
     Главная функция программы.
 
@@ -152,11 +439,14 @@ def main():
     В цикле отображается меню, пользователь выбирает пункты меню, и
     соответствующие методы объекта IOWorker вызываются.
 
+    :param db_path: путь к базе данных SQLite; если не указан, книги хранятся в library.json
+    :param page_size: количество книг на одной странице вывода
+    :param sort_key: поле, по которому упорядочивается вывод книг
+    :param reverse: выводить ли книги в обратном порядке
+    :param shards: каталог хранилища, разделенного по диапазонам id
     """
-    if not exists("library.json"):
-        open("library.json", "w+").close()
-    library = Library()
-    worker = IOWorker(library)
+    library = open_library(db_path, shards=shards)
+    worker = IOWorker(library, page_size, sort_key, reverse)
     while True:
         print("Меню:\n"
               "1. Добавить книгу.\n"
@@ -165,6 +455,7 @@ def main():
               "4. Отобразить все книги.\n"
               "5. Найти книгу.\n"
               "6. Выход.\n"
+              "7. Сводка по библиотеке.\n"
               )
         choice = input("Выберите действие: ")
         match choice:
@@ -186,12 +477,39 @@ def main():
             case "6":
                 sys.exit()
 
+            case "7":
+                worker.show_summary()
+
             case _:
                 print("\nПожалуйста выберите номер из меню ниже :)\n")
 
 
 if __name__ == '__main__':
+    args = parse_args()
+    if args.migrate:
+        if args.shards is not None:
+            shard_size = {} if args.shard_size is None else {"shard_size": args.shard_size}
+            print(f"Перенесено книг: {migrate_json_to_shards('library.json', args.shards, **shard_size)}")
+            sys.exit()
+        if args.db is None:
+            sys.exit("Для переноса укажите базу данных в --db или каталог в --shards")
+        print(f"Перенесено книг: {migrate_json_to_sqlite('library.json', args.db)}")
+        sys.exit()
+    if args.rebalance:
+        if args.shards is None:
+            sys.exit("Для перераспределения укажите каталог в --shards")
+        print(f"Разделов: {ShardedStorage(args.shards).rebalance(args.shard_size)}")
+        sys.exit()
+    if args.export_path is not None:
+        print(json.dumps(export_books(open_library(args.db, shards=args.shards), args.export_path), ensure_ascii=False))
+        sys.exit()
+    if args.batch is not None:
+        sys.exit(1 if run_batch(args.batch, args.db, shards=args.shards)["errors"] else 0)
+    if args.import_path is not None:
+        print(json.dumps(import_books(open_library(args.db, shards=args.shards), args.import_path,
+                                      report_path=args.report, workers=args.workers), ensure_ascii=False))
+        sys.exit()
     try:
-        main()
+        main(args.db, args.page_size, args.sort, args.reverse, args.shards)
     except KeyboardInterrupt:
         print("\nДля этого есть отдельная функция, пожалуйста используйте её)\n")
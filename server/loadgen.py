@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List, Tuple
+from urllib.parse import quote
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  method: str, target: str, body: object = None) -> Tuple[int, object]:
+    """
+    Функция, отправляющая HTTP-запрос по открытому соединению и читающая ответ.
+
+    :param reader: поток чтения соединения
+    :param writer: поток записи соединения
+    :param method: str, HTTP-метод
+    :param target: str, путь запроса
+    :param body: объект, передаваемый в теле запроса в формате JSON
+    :return: tuple, код ответа и разобранное тело ответа
+    """
+    data = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else b''
+    writer.write(f'{method} {target} HTTP/1.1\r\nHost: library\r\nContent-Length: {len(data)}\r\n\r\n'
+                 .encode('latin-1') + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Функция, возвращающая перцентиль по отсортированному списку значений.
+
+    :param values: list[float], отсортированные значения
+    :param fraction: float, доля от 0 до 1
+    :return: float, значение перцентиля
+    """
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def client(host: str, port: int, requests: int, write_ratio: float, ids: List[int],
+                 words: List[str], latencies: List[float], seed: int):
+    """
+    Функция одного клиента нагрузки.
+
+    Клиент открывает одно соединение и отправляет requests запросов:
+    с вероятностью write_ratio изменение статуса книги, иначе поиск
+    или получение книги по id.
+
+    :param host: str, адрес сервера
+    :param port: int, порт сервера
+    :param requests: int, количество запросов
+    :param write_ratio: float, доля запросов на изменение
+    :param ids: list[int], id книг, используемых в запросах
+    :param words: list[str], фрагменты названий для поиска
+    :param latencies: list[float], список, в который добавляются задержки запросов
+    :param seed: int, начальное значение генератора случайных чисел
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            roll = rng.random()
+            start = time.perf_counter()
+            if roll < write_ratio and ids:
+                status = rng.choice(['в наличии', 'выдана'])
+                await request(reader, writer, 'PATCH', f'/books/{rng.choice(ids)}', {'status': status})
+            elif roll < (1 + write_ratio) / 2 and words:
+                await request(reader, writer, 'GET', f'/search?mode=prefix&limit=20&title={quote(rng.choice(words))}')
+            elif ids:
+                await request(reader, writer, 'GET', f'/books/{rng.choice(ids)}')
+            else:
+                await request(reader, writer, 'GET', '/books?limit=20')
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run(host: str, port: int, clients: int, requests: int, write_ratio: float) -> dict:
+    """
+    Функция, запускающая нагрузку и возвращающая сводку задержек.
+
+    :param host: str, адрес сервера
+    :param port: int, порт сервера
+    :param clients: int, количество одновременных клиентов
+    :param requests: int, количество запросов каждого клиента
+    :param write_ratio: float, доля запросов на изменение
+    :return: dict, количество запросов, пропускная способность, p50 и p99 в миллисекундах
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    _, books = await request(reader, writer, 'GET', '/books?limit=1000')
+    writer.close()
+    ids = [book['id'] for book in books]
+    words = sorted({book['title'][:3] for book in books if len(book['title']) >= 3})
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, write_ratio, ids, words, latencies, seed)
+                           for seed in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'requests_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def main():
+    """
+    Функция запуска генератора нагрузки из командной строки.
+    """
+    parser = argparse.ArgumentParser(description="Генератор нагрузки для HTTP-сервера библиотеки")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес сервера")
+    parser.add_argument("--port", type=int, default=8080, help="порт сервера")
+    parser.add_argument("--clients", type=int, default=50, help="количество одновременных клиентов")
+    parser.add_argument("--requests", type=int, default=200, help="количество запросов каждого клиента")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="доля запросов на изменение статуса")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.host, args.port, args.clients, args.requests, args.write_ratio))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+import argparse
+import asyncio
+import json
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from library.metrics import Metrics
+from main import BatchWorker, open_library
+
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+
+class CommitError(Exception):
+    """
+    Исключение, которое получают запросы группы, если ее фиксация не удалась
+    """
+
+
+class LibraryServer:
+    """
+    Класс HTTP-сервера библиотеки
+
+    Сервер обслуживает один объект библиотеки для многих клиентов.
+    Запросы на чтение выполняются сразу в цикле событий. Изменения
+    ставятся в очередь единственного писателя: все изменения, накопившиеся
+    в очереди, выполняются в одной транзакции библиотеки и сохраняются
+    одной записью (групповая фиксация).
+
+    Маршруты:
+        GET /books?offset=&limit=            - список книг
+        GET /books/<id>                      - книга по id
+        GET /search?title=&author=&year=&mode=&limit= - поиск книг
+        GET /stats                           - снимок метрик библиотеки
+        POST /books {title, author, year}    - добавление книги
+        PATCH /books/<id> {status}           - изменение статуса книги
+        DELETE /books/<id>                   - удаление книги
+
+    Attributes:
+        library (Library): Объект библиотеки.
+        host (str): Адрес, на котором принимаются соединения.
+        port (int): Порт, на котором принимаются соединения.
+        commit_delay (float): Время в секундах, в течение которого писатель
+            собирает изменения в одну группу.
+        commits (int): Количество выполненных групповых фиксаций.
+    """
+
+    def __init__(self, library, host: str = '127.0.0.1', port: int = 8080, commit_delay: float = 0.0):
+        """
+        Конструктор класса LibraryServer
+
+        :param library: Объект библиотеки
+        :param host: Адрес, на котором принимаются соединения
+        :param port: Порт, на котором принимаются соединения; 0 - любой свободный
+        :param commit_delay: Время в секундах, в течение которого писатель собирает изменения в одну группу
+        """
+        self.library = library
+        self.host = host
+        self.port = port
+        self.commit_delay = commit_delay
+        self.commits = 0
+        self._worker = BatchWorker(library, None)
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """
+        Метод, запускающий прием соединений и задачу писателя.
+
+        Если сервер создан с портом 0, после запуска self.port содержит выбранный порт.
+        """
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Метод, запускающий сервер и обслуживающий клиентов до отмены.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Метод, останавливающий прием соединений и задачу писателя.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+
+    async def _writer(self):
+        """
+        Задача единственного писателя.
+
+        Забирает из очереди все накопившиеся изменения, выполняет их в одной
+        транзакции и передает результат каждому ожидающему запросу.
+        """
+        while True:
+            batch = [await self._queue.get()]
+            if self.commit_delay:
+                await asyncio.sleep(self.commit_delay)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            results = []
+            try:
+                with self.library.transaction():
+                    for command, _ in batch:
+                        try:
+                            results.append(self._worker.execute(command))
+                        except (AttributeError, KeyError, TypeError, ValueError) as error:
+                            results.append({'ok': False, 'error': f'{type(error).__name__}: {error}'})
+            except Exception as error:
+                failure = CommitError(f'{type(error).__name__}: {error}')
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(failure)
+                continue
+            self.commits += 1
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def submit(self, command: dict) -> dict:
+        """
+        Метод, ставящий изменение в очередь писателя и ожидающий его фиксации.
+
+        :param command: dict, команда в формате BatchWorker
+        :return: dict, результат выполнения команды
+        :raises CommitError: если фиксация группы, в которую попала команда, не удалась
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((command, future))
+        return await future
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Метод, обслуживающий одно HTTP-соединение.
+
+        Поддерживается HTTP/1.1 с повторным использованием соединения.
+
+        :param reader: поток чтения соединения
+        :param writer: поток записи соединения
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                status, payload = await self.dispatch(method, target, body)
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                             f'Content-Type: application/json; charset=utf-8\r\n'
+                             f'Content-Length: {len(data)}\r\n'
+                             f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        """
+        Метод, выполняющий HTTP-запрос.
+
+        :param method: str, HTTP-метод
+        :param target: str, путь запроса со строкой параметров
+        :param body: bytes, тело запроса
+        :return: tuple, код ответа и объект, сериализуемый в JSON
+        """
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+        try:
+            data = json.loads(body) if body else {}
+            match method, parts:
+                case 'GET', ['books']:
+                    offset = int(query.get('offset', 0))
+                    limit = int(query.get('limit', 100))
+                    books = self.library.page(offset, limit)
+                    return 200, [book.to_dict() for book in books]
+                case 'GET', ['books', book_id]:
+                    book = self.library.get_book(int(book_id))
+                    if book is None:
+                        return 404, {'ok': False, 'error': 'Книга не найдена'}
+                    return 200, book.to_dict()
+                case 'GET', ['search']:
+                    command = {key: query.get(key) for key in ('title', 'author', 'year', 'mode')}
+                    command['op'] = 'search'
+                    command['mode'] = command['mode'] or 'exact'
+                    command['limit'] = int(query['limit']) if 'limit' in query else None
+                    return 200, self._worker.execute(command)['books']
+                case 'GET', ['stats']:
+                    return 200, self.library.stats()
+                case 'POST', ['books']:
+                    result = await self.submit({'op': 'add', 'title': data.get('title'),
+                                                'author': data.get('author'), 'year': data.get('year')})
+                    return (201 if result['ok'] else 400), result
+                case 'PATCH', ['books', book_id]:
+                    result = await self.submit({'op': 'status', 'id': int(book_id), 'status': data['status']})
+                case 'DELETE', ['books', book_id]:
+                    result = await self.submit({'op': 'delete', 'id': int(book_id)})
+                case _:
+                    return 405, {'ok': False, 'error': 'Неизвестный запрос'}
+        except CommitError as error:
+            return 500, {'ok': False, 'error': f'Изменение не сохранено: {error}'}
+        except (AttributeError, KeyError, TypeError, ValueError) as error:
+            return 400, {'ok': False, 'error': f'{type(error).__name__}: {error}'}
+        if result['ok']:
+            return 200, result
+        return (404 if 'error' not in result else 400), result
+
+
+def main():
+    """
+    Функция запуска сервера из командной строки.
+    """
+    parser = argparse.ArgumentParser(description="HTTP-сервер библиотеки")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес, на котором принимаются соединения")
+    parser.add_argument("--port", type=int, default=8080, help="порт, на котором принимаются соединения")
+    parser.add_argument("--db", help="путь к базе данных SQLite, используемой вместо library.json")
+    parser.add_argument("--shards", metavar="DIR",
+                        help="каталог хранилища, разделенного по диапазонам id, используемого вместо library.json")
+    parser.add_argument("--journal", action="store_true",
+                        help="вести журнал изменений рядом с library.json вместо перезаписи файла")
+    parser.add_argument("--commit-delay", type=float, default=0.0,
+                        help="время в секундах, в течение которого изменения собираются в одну фиксацию")
+    parser.add_argument("--metrics", action="store_true", help="собирать метрики операций библиотеки")
+    args = parser.parse_args()
+    library = open_library(args.db, args.journal, args.shards)
+    if args.metrics:
+        library.metrics = Metrics()
+    server = LibraryServer(library, args.host, args.port, args.commit_delay)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import unittest
+import json
+import os
+from io import StringIO
+from unittest.mock import patch
+from library.library import Library
+from main import BatchWorker
+import tempfile
+
+class TestBatchWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump([], file)
+        self.library = Library(self.test_file_path)
+        self.output = StringIO()
+        self.worker = BatchWorker(self.library, self.output)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_commands(self, *commands):
+        lines = [command if isinstance(command, str) else json.dumps(command) for command in commands]
+        summary = self.worker.run(line + '\n' for line in lines)
+        return summary, [json.loads(line) for line in self.output.getvalue().splitlines()]
+
+    def test_run(self):
+        with patch.object(self.library.storage, 'save', wraps=self.library.storage.save) as save:
+            summary, results = self.run_commands(
+                {'op': 'add', 'title': 'Title1', 'author': 'Author1', 'year': 2000},
+                {'op': 'add', 'title': 'Title2', 'author': 'Author2', 'year': '2001'},
+                {'op': 'status', 'id': 1, 'status': 'Выдана'},
+                {'op': 'delete', 'id': 2},
+                {'op': 'search', 'title': 'title', 'mode': 'prefix'},
+            )
+        save.assert_called_once()
+        self.assertEqual(summary['operations'], 5)
+        self.assertEqual(summary['errors'], 0)
+        self.assertEqual([result['ok'] for result in results], [True] * 5)
+        self.assertEqual(results[0]['id'], 1)
+        self.assertEqual(results[4]['books'],
+                         [{'id': 1, 'title': 'Title1', 'author': 'Author1', 'year': 2000, 'status': 'выдана'}])
+        library = Library(self.test_file_path)
+        self.assertEqual([book.to_dict() for book in library.books], results[4]['books'])
+
+    def test_errors_do_not_stop_batch(self):
+        summary, results = self.run_commands(
+            'not json',
+            {'op': 'add', 'title': 'Title1', 'author': 'Author1', 'year': 3000},
+            {'op': 'status', 'id': 1, 'status': 'потеряна'},
+            {'op': 'delete', 'id': 'x'},
+            {'op': 'rename'},
+            {'op': 'add', 'title': 'Title1', 'author': 'Author1', 'year': 2000},
+            '',
+        )
+        self.assertEqual(summary['operations'], 6)
+        self.assertEqual(summary['errors'], 5)
+        self.assertEqual([result['line'] for result in results], [1, 2, 3, 4, 5, 6])
+        self.assertTrue(results[5]['ok'])
+        self.assertEqual(len(Library(self.test_file_path).books), 1)
+
+    def test_failed_save_rolls_back(self):
+        with patch.object(self.library.storage, 'apply', side_effect=OSError('disk full')):
+            summary, results = self.run_commands(
+                {'op': 'add', 'title': 'Title1', 'author': 'Author1', 'year': 2000},
+                {'op': 'search', 'title': 'Title1'},
+            )
+        self.assertEqual((summary['operations'], summary['errors'], summary['rolled_back']), (2, 2, True))
+        self.assertEqual(results, [{'ok': False, 'rolled_back': True, 'error': 'OSError: disk full'}])
+        self.assertEqual(self.library.books, [])
+
+if __name__ == '__main__':
+    unittest.main()
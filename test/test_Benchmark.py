@@ -0,0 +1,39 @@
+import unittest
+import json
+import os
+import tempfile
+from benchmark.catalog import generate_books, write_catalog
+from benchmark.run import bench_size, compare
+from library.library import Library
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_catalog_is_deterministic(self):
+        self.assertEqual(list(generate_books(100, seed=1)), list(generate_books(100, seed=1)))
+        self.assertNotEqual(list(generate_books(100, seed=1)), list(generate_books(100, seed=2)))
+
+    def test_catalog_is_loadable(self):
+        path = os.path.join(self.temp_dir.name, 'library.json')
+        size = write_catalog(path, 500)
+        self.assertEqual(size, os.path.getsize(path))
+        with open(path, 'r', encoding='utf-8') as file:
+            self.assertEqual(json.load(file), list(generate_books(500)))
+        library = Library(path)
+        self.assertEqual([book.book_id for book in library.books], list(range(1, 501)))
+
+    def test_bench_size_reports_operations(self):
+        result = bench_size(200, self.temp_dir.name, calls=2)
+        self.assertEqual(result['books'], 200)
+        for name in ('load_books', 'save_books', 'add_book', 'delete_book', 'update_book_status',
+                     'search_book[author]'):
+            self.assertEqual(result['operations'][name]['calls'], 2)
+            self.assertIn('peak_bytes', result['operations'][name])
+        report = {'results': {'200': result}}
+        self.assertTrue(all(line.strip().endswith('1.00x') for line in compare(report, report)))
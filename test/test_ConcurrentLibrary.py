@@ -0,0 +1,90 @@
+import unittest
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from library.library import Library
+from library.locking import RWLock
+
+
+def add_books(file_path, prefix, count):
+    library = Library(file_path, process_safe=True)
+    for i in range(count):
+        library.add_book(f'{prefix}-{i}', 'Author', 2000)
+
+
+class TestConcurrentLibrary(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump([], file)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_snapshot(self):
+        with open(self.test_file_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def test_threads_do_not_lose_updates(self):
+        library = Library(self.test_file_path, thread_safe=True)
+        threads = [threading.Thread(target=lambda n=n: [library.add_book(f'T{n}-{i}', 'Author', 2000)
+                                                        for i in range(50)])
+                   for n in range(8)]
+        readers = [threading.Thread(target=lambda: [library.search_book(author='Author') for _ in range(50)])
+                   for _ in range(4)]
+        for thread in threads + readers:
+            thread.start()
+        for thread in threads + readers:
+            thread.join()
+        self.assertEqual(len(library.books), 400)
+        self.assertEqual(sorted(book.book_id for book in library.books), list(range(1, 401)))
+        self.assertEqual(len(self.read_snapshot()), 400)
+
+    def test_processes_do_not_lose_updates(self):
+        context = multiprocessing.get_context('spawn')
+        processes = [context.Process(target=add_books, args=(self.test_file_path, f'P{n}', 20)) for n in range(3)]
+        for process in processes:
+            process.start()
+        add_books(self.test_file_path, 'main', 20)
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        snapshot = self.read_snapshot()
+        self.assertEqual(len(snapshot), 80)
+        self.assertEqual(sorted(book['id'] for book in snapshot), list(range(1, 81)))
+
+    def test_reader_sees_changes_of_other_process(self):
+        reader = Library(self.test_file_path, process_safe=True)
+        add_books(self.test_file_path, 'other', 3)
+        self.assertEqual(len(reader.books), 3)
+        reader.add_book('Title', 'Author', 2000)
+        self.assertEqual(reader.get_book(4).title, 'Title')
+
+    def test_rwlock_allows_parallel_reads(self):
+        lock = RWLock()
+        barrier = threading.Barrier(3, timeout=5)
+
+        def read():
+            with lock.read():
+                barrier.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(barrier.broken)
+
+    def test_rwlock_rejects_upgrade(self):
+        lock = RWLock()
+        with lock.read():
+            with self.assertRaises(RuntimeError):
+                with lock.write():
+                    pass
+        with lock.write():
+            with lock.read():
+                self.assertTrue(lock.held())
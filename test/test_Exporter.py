@@ -0,0 +1,107 @@
+import unittest
+import csv
+import gzip
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from library.exporter import export_books
+from library.importer import detect_format, import_books
+from library.library import Library
+from library.query import Eq
+
+
+class TestExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump([], file)
+        self.library = Library(self.test_file_path)
+        self.library.add_books([('Title1', 'Author1', 2000), ('Заглавие, "в кавычках"', 'Автор', 1999),
+                                ('Title3', 'Author1', 2001)])
+        self.library.update_book_status(2, 'выдана')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def expected(self, books=None):
+        return [book.to_dict() for book in (self.library.books if books is None else books)]
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format('out.ndjson'), 'jsonl')
+        self.assertEqual(detect_format('out.CSV.gz', compressed=True), 'csv')
+        with self.assertRaises(ValueError):
+            detect_format('out.csv.gz')
+        with self.assertRaises(ValueError):
+            detect_format('out.txt')
+        with self.assertRaises(ValueError):
+            export_books(self.library, self.path('out.xml'))
+
+    def test_jsonl(self):
+        result = export_books(self.library, self.path('out.jsonl'), chunk_size=2)
+        self.assertEqual(result['exported'], 3)
+        self.assertEqual(result['bytes'], os.path.getsize(self.path('out.jsonl')))
+        with open(self.path('out.jsonl'), 'r', encoding='utf-8') as file:
+            self.assertEqual([json.loads(line) for line in file], self.expected())
+
+    def test_json_array(self):
+        export_books(self.library, self.path('out.json'), chunk_size=2)
+        with open(self.path('out.json'), 'r', encoding='utf-8') as file:
+            self.assertEqual(json.load(file), self.expected())
+        export_books(self.library, self.path('empty.json.gz'), [])
+        with gzip.open(self.path('empty.json.gz'), 'rt', encoding='utf-8') as file:
+            self.assertEqual(json.load(file), [])
+        copy = Library(self.path('out.json'))
+        self.assertEqual(self.expected(copy.books), self.expected())
+
+    def test_csv(self):
+        export_books(self.library, self.path('out.csv'), chunk_size=1)
+        with open(self.path('out.csv'), 'r', encoding='utf-8', newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual([{**row, 'id': int(row['id']), 'year': int(row['year'])} for row in rows], self.expected())
+
+    def test_gzip(self):
+        export_books(self.library, self.path('out.ndjson.gz'))
+        with gzip.open(self.path('out.ndjson.gz'), 'rt', encoding='utf-8') as file:
+            self.assertEqual([json.loads(line) for line in file], self.expected())
+        export_books(self.library, self.path('plain.csv'), compress=True)
+        with gzip.open(self.path('plain.csv'), 'rt', encoding='utf-8') as file:
+            self.assertEqual(file.readline().strip(), 'id,title,author,year,status')
+
+    def test_result_set(self):
+        books = self.library.search_book(author='author1')
+        self.assertEqual(export_books(self.library, self.path('out.jsonl'), books)['exported'], 2)
+        with open(self.path('out.jsonl'), 'r', encoding='utf-8') as file:
+            self.assertEqual([json.loads(line) for line in file], self.expected(books))
+        export_books(self.library, self.path('query.jsonl'), self.library.query(Eq('status', 'выдана')))
+        with open(self.path('query.jsonl'), 'r', encoding='utf-8') as file:
+            self.assertEqual([json.loads(line)['id'] for line in file], [2])
+
+    def test_import_round_trip(self):
+        export_books(self.library, self.path('out.csv'))
+        path = self.path('copy.json')
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump([], file)
+        copy = Library(path)
+        self.assertEqual(import_books(copy, self.path('out.csv'), workers=0)['imported'], 3)
+        self.assertEqual([(book.title, book.author, book.year) for book in copy.books],
+                         [(book.title, book.author, book.year) for book in self.library.books])
+
+    def test_failure_keeps_previous_file(self):
+        export_books(self.library, self.path('out.jsonl'))
+        with patch('library.exporter.encode_chunk', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                export_books(self.library, self.path('out.jsonl'))
+        with open(self.path('out.jsonl'), 'r', encoding='utf-8') as file:
+            self.assertEqual(len(file.readlines()), 3)
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)),
+                         sorted(['out.jsonl', 'test_library.json', 'test_library.json.snapshot']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,9 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from io import StringIO
+from book.book import Book
 from library.library import Library
-from main import IOWorker, main
+from main import IOWorker, main, parse_args
 
 class TestIOWorker(unittest.TestCase):
 
@@ -97,6 +98,50 @@ class TestIOWorker(unittest.TestCase):
         self.worker.show_all_books()
         self.assertNotIn("Библиотека пуста", mock_stdout.getvalue())
 
+    @patch('builtins.input', side_effect=['n', 'p', 'q'])
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_show_all_books_pages(self, mock_stdout, mock_input):
+        self.library.books = [Book(1, 'b', 'Author', 2001, 'в наличии'), Book(2, 'C', 'Author', 2000, 'выдана'),
+                              Book(3, 'a', 'Author', 2002, 'в наличии')]
+        worker = IOWorker(self.library, page_size=2, sort_key='title')
+        worker.show_all_books()
+        output = mock_stdout.getvalue()
+        self.assertEqual(mock_input.call_count, 3)
+        self.assertEqual(output.count("Страница 1 из 2"), 2)
+        self.assertEqual(output.count("Страница 2 из 2"), 1)
+        self.assertLess(output.index("ID: 3"), output.index("ID: 1"))
+        self.assertLess(output.index("ID: 1"), output.index("ID: 2"))
+
+    @patch('builtins.input', side_effect=['', '', '', '', ''])
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_search_book_pages(self, mock_stdout, mock_input):
+        self.library.search_book.return_value = [Book(1, 'Title', 'Author', 2001, 'в наличии'),
+                                                 Book(2, 'Title', 'Author', 2000, 'выдана')]
+        worker = IOWorker(self.library, page_size=1, sort_key='year', reverse=True)
+        worker.search_book()
+        output = mock_stdout.getvalue()
+        self.assertIn("Страница 2 из 2", output)
+        self.assertLess(output.index("ID: 1"), output.index("ID: 2"))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_show_summary(self, mock_stdout):
+        self.library.summary.return_value = {'total': 3, 'by_status': {'выдана': 1, 'в наличии': 2},
+                                             'by_author': {'Author1': 1, 'Author2': 2},
+                                             'by_years': {1990: 1, 2000: 2}}
+        self.worker.show_summary(top=1)
+        output = mock_stdout.getvalue()
+        self.assertIn("Всего книг: 3", output)
+        self.assertIn("в наличии: 2", output)
+        self.assertIn("1990-1999: 1", output)
+        self.assertIn("Author2: 2", output)
+        self.assertNotIn("Author1", output)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_show_summary_empty(self, mock_stdout):
+        self.library.summary.return_value = {'total': 0, 'by_status': {}, 'by_author': {}, 'by_years': {}}
+        self.worker.show_summary()
+        self.assertIn("Библиотека пуста", mock_stdout.getvalue())
+
     @patch('builtins.input', side_effect=['6'])
     @patch('sys.stdout', new_callable=StringIO)
     def test_main_exit(self, mock_stdout, mock_input):
@@ -105,5 +150,11 @@ class TestIOWorker(unittest.TestCase):
                 with self.assertRaises(SystemExit):
                     main()
 
+    def test_shard_size_defaults_to_current(self):
+        self.assertIsNone(parse_args(['--rebalance', '--shards', 'library.shards']).shard_size)
+        self.assertEqual(parse_args(['--rebalance', '--shards', 'library.shards', '--shard-size', '5']).shard_size, 5)
+        with patch('sys.stderr', new_callable=StringIO), self.assertRaises(SystemExit):
+            parse_args(['--shard-size', '0'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
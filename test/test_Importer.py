@@ -0,0 +1,85 @@
+import unittest
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from book.book import validate_book
+from library.importer import import_books
+from library.library import Library
+
+
+class TestImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        self.report_path = os.path.join(self.temp_dir.name, 'report.jsonl')
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump([{'id': 1, 'title': 'Title1', 'author': 'Author1', 'year': 2000, 'status': 'в наличии'}], file)
+        self.library = Library(self.test_file_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def read_report(self):
+        with open(self.report_path, 'r', encoding='utf-8') as file:
+            return [json.loads(line) for line in file]
+
+    def test_validate_book(self):
+        self.assertEqual(validate_book(' Title ', 'Author', '2000'), ('Title', 'Author', 2000))
+        for title, author, year in [('', 'Author', 2000), ('Title', None, 2000), ('Title', 'Author', 'abc'),
+                                    ('Title', 'Author', 2000.5), ('Title', 'Author', -1), ('Title', 'Author', 9999)]:
+            with self.assertRaises(ValueError):
+                validate_book(title, author, year)
+
+    def test_import_csv(self):
+        path = self.write('books.csv', 'title,author,year\n'
+                                       'Title2,Author2,2001\n'
+                                       ' title1 ,AUTHOR1,2000\n'
+                                       'Title3,,2002\n'
+                                       'Title4,Author4,year\n'
+                                       '"Title, 5",Author5,2005\n'
+                                       'Title2,Author2,2001\n')
+        with patch.object(self.library.storage, 'save', wraps=self.library.storage.save) as save:
+            summary = import_books(self.library, path, report_path=self.report_path, workers=0)
+        save.assert_called_once()
+        self.assertEqual({key: summary[key] for key in ('read', 'imported', 'rejected', 'duplicates')},
+                         {'read': 6, 'imported': 2, 'rejected': 2, 'duplicates': 2})
+        self.assertEqual([(book.book_id, book.title) for book in Library(self.test_file_path).books],
+                         [(1, 'Title1'), (2, 'Title2'), (3, 'Title, 5')])
+        self.assertEqual([(row['line'], row['error']) for row in self.read_report()],
+                         [(3, 'Книга уже есть в каталоге'), (4, 'Данные книги не корректны'),
+                          (5, 'Год издания должен быть целым числом'), (7, 'Книга уже есть в каталоге')])
+
+    def test_import_jsonl_in_processes(self):
+        lines = [json.dumps({'title': f'Title{i}', 'author': 'Author', 'year': 1900 + i % 100}) for i in range(2, 502)]
+        lines[10] = '{"title": "broken"'
+        lines[20] = '[1, 2]'
+        lines[30] = json.dumps({'title': 'Title2', 'author': 'author', 'year': 1902})
+        path = self.write('books.jsonl', '\n'.join(lines) + '\n')
+        summary = import_books(self.library, path, report_path=self.report_path, chunk_size=50, workers=2)
+        self.assertEqual((summary['imported'], summary['rejected'], summary['duplicates']), (497, 2, 1))
+        self.assertEqual([row['line'] for row in self.read_report()], [11, 21, 31])
+        self.assertEqual(len(Library(self.test_file_path).books), 498)
+
+    def test_import_json_array(self):
+        books = [{'title': 'Title2', 'author': 'Author2', 'year': 2001}, 'Title3',
+                 {'id': 7, 'title': 'Title1', 'author': 'Author1', 'year': 2000, 'status': 'выдана'},
+                 {'title': 'Title4', 'author': 'Author4', 'year': 2004}]
+        path = self.write('partner.json', json.dumps(books, ensure_ascii=False, indent=4))
+        summary = import_books(self.library, path, report_path=self.report_path, workers=0)
+        self.assertEqual((summary['read'], summary['imported'], summary['rejected'], summary['duplicates']),
+                         (4, 2, 1, 1))
+        self.assertEqual([row['line'] for row in self.read_report()], [2, 3])
+        self.assertEqual([book.title for book in Library(self.test_file_path).books], ['Title1', 'Title2', 'Title4'])
+
+    def test_unknown_format(self):
+        path = self.write('books.txt', '')
+        with self.assertRaises(ValueError):
+            import_books(self.library, path, workers=0)
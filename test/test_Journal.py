@@ -0,0 +1,88 @@
+import unittest
+import json
+import os
+from library.library import Library
+import tempfile
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump([{'id': 1, 'title': 'Title1', 'author': 'Author1', 'year': 2000, 'status': 'в наличии'}], file)
+        self.library = Library(self.test_file_path, journal=True)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_snapshot(self):
+        with open(self.test_file_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def test_mutations_are_appended(self):
+        self.library.add_book('Title2', 'Author2', 2001)
+        self.library.update_book_status(1, 'выдана')
+        self.library.delete_book(2)
+        self.assertEqual(len(self.read_snapshot()), 1)
+        self.assertEqual(self.library.journal.records, 3)
+        with open(self.library.journal.path, 'r', encoding='utf-8') as file:
+            self.assertEqual([json.loads(line)['op'] for line in file], ['add', 'status', 'delete'])
+
+    def test_load_replays_journal(self):
+        self.library.add_book('Title2', 'Author2', 2001)
+        self.library.update_book_status(1, 'выдана')
+        library = Library(self.test_file_path, journal=True)
+        self.assertEqual([book.book_id for book in library.books], [1, 2])
+        self.assertEqual(library.books[0].status, 'выдана')
+        self.assertEqual(library.next_id, 3)
+        self.assertEqual(library.journal.records, 2)
+
+    def test_compaction(self):
+        self.library.journal.max_records = 2
+        self.library.add_book('Title2', 'Author2', 2001)
+        self.library.add_book('Title3', 'Author3', 2002)
+        self.assertEqual(len(self.read_snapshot()), 3)
+        self.assertEqual(self.library.journal.records, 0)
+        self.assertEqual(os.path.getsize(self.library.journal.path), 0)
+
+    def test_replay_is_idempotent(self):
+        self.library.add_book('Title2', 'Author2', 2001)
+        self.library.delete_book(1)
+        with open(self.library.journal.path, 'r', encoding='utf-8') as file:
+            records = file.read()
+        self.library.save_books()
+        # Журнал, оставшийся после прерванного уплотнения
+        with open(self.library.journal.path, 'w', encoding='utf-8') as file:
+            file.write(records + '{"op": "add", "bo')
+        library = Library(self.test_file_path, journal=True)
+        self.assertEqual([book.book_id for book in library.books], [2])
+
+    def test_torn_record_is_truncated(self):
+        self.library.add_book('Title2', 'Author2', 2001)
+        size = os.path.getsize(self.library.journal.path)
+        # Запись, оборванная сбоем посреди строки
+        with open(self.library.journal.path, 'ab') as file:
+            file.write('{"op": "add", "book": {"id": 9, "title": "Загол'.encode('utf-8')[:-1])
+        library = Library(self.test_file_path, journal=True)
+        self.assertEqual([book.book_id for book in library.books], [1, 2])
+        self.assertEqual(os.path.getsize(library.journal.path), size)
+        library.add_book('Title3', 'Author3', 2002)
+        library.update_book_status(1, 'выдана')
+        library = Library(self.test_file_path, journal=True)
+        self.assertEqual([(book.book_id, book.status) for book in library.books],
+                         [(1, 'выдана'), (2, 'в наличии'), (3, 'в наличии')])
+
+    def test_unterminated_record_is_dropped(self):
+        self.library.add_book('Title2', 'Author2', 2001)
+        with open(self.library.journal.path, 'r', encoding='utf-8') as file:
+            record = file.read()
+        with open(self.library.journal.path, 'w', encoding='utf-8') as file:
+            file.write(record.rstrip('\n'))
+        library = Library(self.test_file_path, journal=True)
+        self.assertEqual([book.book_id for book in library.books], [1])
+        library.add_book('Title2', 'Author2', 2001)
+        self.assertEqual([book.book_id for book in Library(self.test_file_path, journal=True).books], [1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
+from unittest.mock import PropertyMock, patch
 import json
 import os
+import random
+from collections import Counter
 from book.book import Book
 from library.library import Library
 import tempfile
@@ -30,6 +33,14 @@ class TestLibrary(unittest.TestCase):
         self.assertEqual(library.books[0].title, 'Title1')
         self.assertEqual(library.books[1].author, 'Author2')
 
+    def test_load_books_empty_or_invalid_file(self):
+        for content in ('', '[{"id": 1, "title": "Title1"', '[]'):
+            with open(self.test_file_path, 'w', encoding='utf-8') as file:
+                file.write(content)
+            library = Library(self.test_file_path)
+            self.assertEqual(library.books, [])
+            self.assertEqual(library.next_id, 1)
+
     def test_get_next_id(self):
         self.assertEqual(self.library.next_id, 3)
 
@@ -39,11 +50,33 @@ class TestLibrary(unittest.TestCase):
         self.assertEqual(self.library.books[2].title, 'Title3')
         self.assertEqual(self.library.next_id, 4)
 
+    def test_page(self):
+        self.library.add_books([('Title3', 'Author3', 2002), ('Title4', 'Author4', 2003)])
+        with patch.object(Library, '_books', new_callable=PropertyMock) as books:
+            self.assertEqual([book.book_id for book in self.library.page(1, 2)], [2, 3])
+            self.assertEqual([book.book_id for book in self.library.page(3, 10)], [4])
+            self.assertEqual(self.library.page(10, 5), [])
+        books.assert_not_called()
+        with self.assertRaises(ValueError):
+            self.library.page(-1, 5)
+
+    def test_book_slots(self):
+        self.assertFalse(hasattr(self.library.books[0], '__dict__'))
+
     def test_delete_book(self):
         self.assertTrue(self.library.delete_book(1))
         self.assertEqual(len(self.library.books), 1)
         self.assertFalse(self.library.delete_book(1))
 
+    def test_delete_book_keeps_order(self):
+        self.library.add_book('Title3', 'Author3', 2002)
+        self.assertTrue(self.library.delete_book(2))
+        self.assertEqual([book.book_id for book in self.library.books], [1, 3])
+        library = Library(self.test_file_path)
+        self.assertEqual([book.book_id for book in library.books], [1, 3])
+        self.assertTrue(library.update_book_status(3, 'выдана'))
+        self.assertEqual(library.books[1].status, 'выдана')
+
     def test_search_book(self):
         results = self.library.search_book(title='Title1')
         self.assertEqual(len(results), 1)
@@ -53,10 +86,159 @@ class TestLibrary(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].author, 'Author2')
 
+    def test_search_book_indexes(self):
+        self.library.add_book('title1', 'Author3', 2000)
+        results = self.library.search_book(title='TITLE1', year=2000)
+        self.assertEqual([book.book_id for book in results], [1, 3])
+        results = self.library.search_book(title='title1', author='author3', year='2000')
+        self.assertEqual([book.book_id for book in results], [3])
+        self.assertEqual(self.library.search_book(title=None, author=None, year=None), [])
+        self.library.delete_book(1)
+        self.assertEqual([book.book_id for book in self.library.search_book(year=2000)], [3])
+        self.assertEqual(self.library._years, [2000, 2001])
+        self.library.delete_book(2)
+        self.assertEqual(self.library._years, [2000])
+
+    def test_search_book_matches_scan(self):
+        for criteria in ({'title': 'title2'}, {'author': 'AUTHOR1', 'year': 2001},
+                         {'year': 2001, 'status': 'В НАЛИЧИИ'}, {'status': 'в наличии'}):
+            expected = [book for book in self.library.books if book.search(**criteria)]
+            self.assertEqual(self.library.search_book(**criteria), expected)
+
+    def test_search_book_modes(self):
+        self.library.add_books([('Война и мир', 'Лев Толстой', 1869), ('Мир приключений', 'Автор', 1950),
+                                ('Анна Каренина', 'Лев Толстой', 1877)])
+        self.assertEqual([book.book_id for book in self.library.search_book(mode='prefix', title='мир')], [4])
+        self.assertEqual([book.book_id for book in self.library.search_book(mode='substring', title='МИР')], [4, 3])
+        self.assertEqual([book.book_id for book in self.library.search_book(mode='substring', title='ми')], [4, 3])
+        self.assertEqual([book.book_id for book in self.library.search_book(mode='fuzzy', title='война и мор')], [3])
+        self.assertEqual([book.book_id for book in self.library.search_book(mode='fuzzy', author='тлстой')], [3, 5])
+        results = self.library.search_book(mode='substring', limit=1, author='толстой', year=1877)
+        self.assertEqual([book.book_id for book in results], [5])
+        self.assertEqual(self.library.search_book(mode='prefix', limit=1, year=2000), [self.book1])
+        self.library.delete_book(4)
+        self.assertEqual(self.library.search_book(mode='prefix', title='мир'), [])
+        with self.assertRaises(ValueError):
+            self.library.search_book(mode='regex', title='мир')
+
+    def test_add_books(self):
+        with patch.object(self.library.storage, 'save') as save:
+            books = self.library.add_books([('Title3', 'Author3', 2002), ('Title4', 'Author4', 2003)])
+        save.assert_called_once()
+        self.assertEqual([book.book_id for book in books], [3, 4])
+        self.assertEqual(self.library.next_id, 5)
+        self.assertEqual(self.library.search_book(author='author4'), [books[1]])
+
+    def test_update_statuses(self):
+        with patch.object(self.library.storage, 'save') as save:
+            self.assertEqual(self.library.update_statuses({1: 'выдана', 2: 'выдана', 999: 'выдана'}), 2)
+        save.assert_called_once()
+        self.assertEqual([book.status for book in self.library.books], ['выдана', 'выдана'])
+
+    def test_transaction(self):
+        with patch.object(self.library.storage, 'save') as save:
+            with self.library.transaction():
+                self.library.add_book('Title3', 'Author3', 2002)
+                self.library.update_book_status(1, 'выдана')
+                self.library.delete_book(2)
+                save.assert_not_called()
+        save.assert_called_once()
+        self.assertEqual([book.book_id for book in self.library.books], [1, 3])
+
+    def test_transaction_rollback(self):
+        with self.assertRaises(RuntimeError):
+            with self.library.transaction():
+                self.library.add_book('Title3', 'Author3', 2002)
+                self.library.update_book_status(1, 'выдана')
+                self.library.delete_book(2)
+                raise RuntimeError
+        self.assertEqual([book.book_id for book in self.library.books], [1, 2])
+        self.assertEqual(self.library.books[0].status, 'в наличии')
+        self.assertEqual(self.library.next_id, 3)
+        self.assertEqual(self.library.search_book(title='title3'), [])
+        self.assertEqual(len(Library(self.test_file_path).books), 2)
+
+    def test_transaction_rollback_keeps_order(self):
+        self.library.add_books([('Title3', 'Author1', 2000), ('Title4', 'Author1', 2001), ('Title5', 'Author1', 2000)])
+        expected = [book.book_id for book in self.library.search_book(author='author1')]
+        with patch.object(Library, '_books', new_callable=PropertyMock) as books:
+            with self.assertRaises(RuntimeError):
+                with self.library.transaction():
+                    self.library.delete_book(3)
+                    self.library.update_book_status(5, 'выдана')
+                    self.library.delete_book(1)
+                    self.library.add_book('Title6', 'Author1', 2000)
+                    self.library.delete_book(5)
+                    raise RuntimeError
+        books.assert_not_called()
+        self.assertEqual([book.book_id for book in self.library.books], [1, 2, 3, 4, 5])
+        self.assertEqual([book.book_id for book in self.library.search_book(author='author1')], expected)
+        self.assertEqual([book.book_id for book in self.library.search_book(year=2000)], [1, 3, 5])
+        self.assertEqual(self.library.get_book(5).status, 'в наличии')
+        self.assertEqual(self.library.summary(), self.recount(self.library))
+
+    def test_transaction_persist_failure(self):
+        with patch.object(self.library.storage, 'apply', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                with self.library.transaction():
+                    self.library.update_book_status(1, 'выдана')
+                    self.library.add_book('Title3', 'Author3', 2002)
+                    self.library.delete_book(2)
+        self.assertEqual([(book.book_id, book.status) for book in self.library.books],
+                         [(1, 'в наличии'), (2, 'в наличии')])
+        self.assertEqual(self.library.next_id, 3)
+        self.assertEqual(self.library.search_book(status='выдана'), [])
+        self.assertEqual(self.library.summary()['by_status'], {'в наличии': 2})
+
     def test_update_book_status(self):
         self.assertTrue(self.library.update_book_status(1, 'нет в наличии'))
         self.assertEqual(self.library.books[0].status, 'нет в наличии')
         self.assertFalse(self.library.update_book_status(999, 'нет в наличии'))
 
+    def recount(self, library):
+        books = library.books
+        return {'total': len(books),
+                'by_status': dict(Counter(book.status for book in books)),
+                'by_author': dict(Counter(book.author for book in books)),
+                'by_years': dict(sorted(Counter(book.year // 10 * 10 for book in books).items()))}
+
+    def test_summary(self):
+        self.library.add_book('Title3', 'Author1', 2012)
+        self.library.update_book_status(2, 'выдана')
+        self.assertEqual(self.library.summary(), {'total': 3,
+                                                  'by_status': {'в наличии': 2, 'выдана': 1},
+                                                  'by_author': {'Author1': 2, 'Author2': 1},
+                                                  'by_years': {2000: 2, 2010: 1}})
+        self.library.delete_book(3)
+        self.assertEqual(self.library.summary()['by_years'], {2000: 2})
+        self.library.add_book('Title4', 'author1', 2001)
+        self.assertEqual(self.library.summary()['by_author'], {'Author1': 1, 'Author2': 1, 'author1': 1})
+
+    def test_summary_matches_recount(self):
+        rng = random.Random(19)
+        statuses = ['в наличии', 'выдана', 'утеряна']
+        for step in range(300):
+            ids = [book.book_id for book in self.library.books]
+            match rng.randrange(5):
+                case 0:
+                    self.library.add_book(f'Title{step}', f'Author{rng.randrange(5)}', rng.randrange(1950, 2024))
+                case 1:
+                    self.library.add_books((f'Title{step}', f'Author{rng.randrange(5)}', rng.randrange(1950, 2024))
+                                           for _ in range(rng.randrange(4)))
+                case 2:
+                    if ids:
+                        self.library.delete_book(rng.choice(ids))
+                case 3:
+                    self.library.update_statuses({rng.choice(ids): rng.choice(statuses) for _ in range(3)} if ids else {})
+                case 4:
+                    with self.assertRaises(RuntimeError):
+                        with self.library.transaction():
+                            self.library.add_book('Rolled', 'Back', 2000)
+                            if ids:
+                                self.library.update_book_status(rng.choice(ids), rng.choice(statuses))
+                            raise RuntimeError
+            self.assertEqual(self.library.summary(), self.recount(self.library))
+        self.assertEqual(Library(self.test_file_path).summary(), self.recount(self.library))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import asyncio
+import json
+import os
+from unittest.mock import patch
+from library.library import Library
+from library.metrics import Metrics
+from server.loadgen import request, run
+from server.server import LibraryServer
+import tempfile
+
+class TestLibraryServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump([], file)
+        self.library = Library(self.test_file_path)
+        self.library.add_books([('Title1', 'Author1', 2000), ('Title2', 'Author2', 2001)])
+        self.server = LibraryServer(self.library, port=0)
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.close()
+        self.temp_dir.cleanup()
+
+    async def test_reads(self):
+        status, books = await request(self.reader, self.writer, 'GET', '/books?offset=1')
+        self.assertEqual((status, [book['id'] for book in books]), (200, [2]))
+        status, books = await request(self.reader, self.writer, 'GET', '/books?limit=1')
+        self.assertEqual((status, [book['id'] for book in books]), (200, [1]))
+        status, _ = await request(self.reader, self.writer, 'GET', '/books?offset=-1')
+        self.assertEqual(status, 400)
+        status, book = await request(self.reader, self.writer, 'GET', '/books/1')
+        self.assertEqual((status, book['title']), (200, 'Title1'))
+        status, _ = await request(self.reader, self.writer, 'GET', '/books/99')
+        self.assertEqual(status, 404)
+        status, books = await request(self.reader, self.writer, 'GET', '/search?author=author2')
+        self.assertEqual((status, [book['id'] for book in books]), (200, [2]))
+        status, _ = await request(self.reader, self.writer, 'PUT', '/books')
+        self.assertEqual(status, 405)
+
+    async def test_stats(self):
+        status, stats = await request(self.reader, self.writer, 'GET', '/stats')
+        self.assertEqual((status, stats), (200, {}))
+        self.library.metrics = Metrics()
+        await request(self.reader, self.writer, 'GET', '/books/1')
+        status, stats = await request(self.reader, self.writer, 'GET', '/stats')
+        self.assertEqual((status, stats['calls']), (200, {'get_book': 1}))
+
+    async def test_mutations(self):
+        status, result = await request(self.reader, self.writer, 'POST', '/books',
+                                       {'title': 'Title3', 'author': 'Author3', 'year': 2002})
+        self.assertEqual((status, result['id']), (201, 3))
+        status, _ = await request(self.reader, self.writer, 'PATCH', '/books/3', {'status': 'выдана'})
+        self.assertEqual(status, 200)
+        status, _ = await request(self.reader, self.writer, 'DELETE', '/books/1')
+        self.assertEqual(status, 200)
+        status, _ = await request(self.reader, self.writer, 'DELETE', '/books/1')
+        self.assertEqual(status, 404)
+        status, _ = await request(self.reader, self.writer, 'POST', '/books',
+                                  {'title': 'Title4', 'author': 'Author4', 'year': 3000})
+        self.assertEqual(status, 400)
+        library = Library(self.test_file_path)
+        self.assertEqual([(book.book_id, book.status) for book in library.books], [(2, 'в наличии'), (3, 'выдана')])
+
+    async def test_post_ignores_op(self):
+        status, _ = await request(self.reader, self.writer, 'POST', '/books', {'op': 'delete', 'id': 1})
+        self.assertEqual(status, 400)
+        status, _ = await request(self.reader, self.writer, 'POST', '/books',
+                                  {'op': 'status', 'id': 1, 'status': 'выдана', 'title': 'Title3',
+                                   'author': 'Author3', 'year': 2002})
+        self.assertEqual(status, 201)
+        self.assertEqual([(book.book_id, book.status) for book in self.library.books],
+                         [(1, 'в наличии'), (2, 'в наличии'), (3, 'в наличии')])
+
+    async def test_commit_failure(self):
+        with patch.object(self.library.storage, 'save', side_effect=OSError('disk full')):
+            status, result = await request(self.reader, self.writer, 'PATCH', '/books/1', {'status': 'выдана'})
+        self.assertEqual(status, 500)
+        self.assertIn('disk full', result['error'])
+        status, book = await request(self.reader, self.writer, 'GET', '/books/1')
+        self.assertEqual((status, book['status']), (200, 'в наличии'))
+
+    async def test_group_commit(self):
+        with patch.object(self.library.storage, 'save', wraps=self.library.storage.save) as save:
+            results = await asyncio.gather(*(self.server.submit({'op': 'status', 'id': 1 + i % 2, 'status': 'выдана'})
+                                             for i in range(20)))
+        self.assertTrue(all(result['ok'] for result in results))
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(self.server.commits, 1)
+
+    async def test_loadgen(self):
+        summary = await run('127.0.0.1', self.server.port, clients=4, requests=10, write_ratio=0.5)
+        self.assertEqual(summary['requests'], 40)
+        self.assertLessEqual(summary['p50_ms'], summary['p99_ms'])
+
+if __name__ == '__main__':
+    unittest.main()
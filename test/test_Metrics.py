@@ -0,0 +1,84 @@
+import unittest
+import json
+import os
+import tempfile
+from library.library import Library
+from library.metrics import Histogram, Metrics
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump([{'id': 1, 'title': 'Title1', 'author': 'Author1', 'year': 2000, 'status': 'в наличии'},
+                       {'id': 2, 'title': 'Title2', 'author': 'Author1', 'year': 2001, 'status': 'в наличии'}], file)
+        self.library = Library(self.test_file_path, metrics=Metrics())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_disabled_by_default(self):
+        library = Library(self.test_file_path)
+        library.search_book(author='Author1')
+        self.assertIsNone(library.metrics)
+        self.assertEqual(library.stats(), {})
+        self.assertEqual(library.stats_text(), '')
+
+    def test_calls_and_latency(self):
+        self.library.search_book(author='Author1')
+        self.library.search_book(title='Title2')
+        self.library.get_book(1)
+        stats = self.library.stats()
+        self.assertEqual(stats['calls'], {'load_books': 1, 'search_book': 2, 'get_book': 1})
+        self.assertEqual(stats['latency_seconds']['search_book']['count'], 2)
+        self.assertEqual(stats['latency_seconds']['search_book']['buckets']['+Inf'], 2)
+
+    def test_bytes_written(self):
+        self.library.add_book('Title3', 'Author2', 2002)
+        self.library.save_books()
+        stats = self.library.stats()
+        self.assertEqual(stats['calls']['add_book'], 1)
+        self.assertEqual(stats['calls']['persist'], 1)
+        self.assertEqual(stats['bytes_written']['count'], 2)
+        self.assertEqual(stats['bytes_written']['sum'], 2 * os.path.getsize(self.test_file_path))
+
+    def test_books_scanned(self):
+        self.library.search_book(author='Author1', year=2001)
+        self.library.search_book(status='в наличии')
+        stats = self.library.stats()
+        self.assertEqual(stats['books_scanned']['count'], 2)
+        self.assertEqual(stats['books_scanned']['sum'], 1 + 2)
+
+    def test_prometheus(self):
+        self.library.search_book(author='Author1')
+        text = self.library.stats_text()
+        self.assertIn('library_calls_total{operation="search_book"} 1\n', text)
+        self.assertIn('library_latency_seconds_bucket{operation="search_book",le="+Inf"} 1\n', text)
+        self.assertIn('library_latency_seconds_count{operation="search_book"} 1\n', text)
+        self.assertIn('library_books_scanned_sum 2\n', text)
+
+    def test_profile_every(self):
+        metrics = Metrics(profile_every=2)
+        self.assertIsNone(metrics.profile_stats())
+        library = Library(self.test_file_path, metrics=metrics)
+        library.search_book(author='Author1')
+        self.assertIsNone(metrics.profile_stats())
+        library.search_book(title='Title1')
+        self.assertIn('_search_exact', metrics.profile_stats())
+
+    def test_histogram(self):
+        histogram = Histogram((1, 10))
+        for value in (0, 1, 5, 50):
+            histogram.observe(value)
+        self.assertEqual(histogram.snapshot(), {'count': 4, 'sum': 56, 'buckets': {'1': 2, '10': 3, '+Inf': 4}})
+
+    def test_exact_values(self):
+        metrics = Metrics()
+        metrics.record_bytes(1_048_576)
+        metrics.record_bytes(2_000_000)
+        text = metrics.prometheus()
+        self.assertIn('library_bytes_written_bucket{le="1048576"} 1\n', text)
+        self.assertIn('library_bytes_written_sum 3048576\n', text)
+        self.assertEqual(list(Histogram([0.0001, 2.5]).cumulative()), ['0.0001', '2.5', '+Inf'])
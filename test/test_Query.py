@@ -0,0 +1,103 @@
+import unittest
+import json
+import os
+import random
+import tempfile
+from unittest.mock import patch
+from library.library import Library
+from library.query import And, Eq, Or, Range
+
+
+class TestQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump([], file)
+        self.library = Library(self.test_file_path)
+        rng = random.Random(20)
+        self.library.add_books((f'Title{rng.randrange(30)}', f'Author{rng.randrange(8)}', rng.randrange(1980, 2000))
+                               for _ in range(300))
+        self.library.update_statuses({book_id: 'выдана' for book_id in rng.sample(range(1, 301), 100)})
+        for book_id in rng.sample(range(1, 301), 20):
+            self.library.delete_book(book_id)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def ids(self, books):
+        return [book.book_id for book in books]
+
+    def expected(self, where, order_by=None, limit=None):
+        books = [book for book in self.library.books if where is None or where.matches(book)]
+        if order_by is not None:
+            field = order_by.lstrip('-')
+            attribute = 'book_id' if field == 'id' else field
+
+            def value(book):
+                return getattr(book, attribute).lower() if field in ('title', 'author', 'status') \
+                    else getattr(book, attribute)
+            books = sorted(books, key=lambda book: book.book_id)
+            books = sorted(books, key=value, reverse=order_by.startswith('-'))
+        return self.ids(books[:limit] if limit is not None else books)
+
+    def test_eq(self):
+        self.assertEqual(self.ids(self.library.query(Eq('author', 'AUTHOR3'))), self.expected(Eq('author', 'Author3')))
+        self.assertEqual(self.ids(self.library.query(Eq('id', 5))), self.expected(Eq('id', 5)))
+        self.assertEqual(self.ids(self.library.query(Eq('title', 'Missing'))), [])
+
+    def test_year_range(self):
+        where = Range('year', 1985, 1989)
+        self.assertEqual(self.ids(self.library.query(where)), self.expected(where))
+        self.assertEqual(self.ids(self.library.query(Range('year', high=1981))), self.expected(Range('year', high=1981)))
+        self.assertEqual(self.ids(self.library.query(Range('year', 2001))), [])
+
+    def test_combinations(self):
+        queries = [
+            And(Range('year', 1990), Eq('status', 'Выдана')),
+            Eq('author', 'Author1') | Eq('author', 'Author2'),
+            Or(Range('year', 1980, 1984), Range('year', 1983, 1986)) & Eq('status', 'в наличии'),
+            Or(Eq('title', 'Title1'), Eq('status', 'выдана')),
+            And(Eq('title', 'Title2'), Or(Eq('year', 1990), Range('year', 1995, 1999))),
+            And(),
+        ]
+        for where in queries:
+            with self.subTest(where=where):
+                self.assertEqual(self.ids(self.library.query(where)), self.expected(where))
+
+    def test_order_and_limit(self):
+        rng = random.Random(21)
+        predicates = [None, Eq('status', 'в наличии'), Range('year', 1985, 1992), Eq('author', 'Author4'),
+                      Eq('author', 'Author4') | Range('year', 1995)]
+        for where in predicates:
+            for order_by in ('year', '-year', 'title', '-author', 'id', '-status'):
+                limit = rng.choice([None, 0, 1, 7, 1000])
+                with self.subTest(where=where, order_by=order_by, limit=limit):
+                    self.assertEqual(self.ids(self.library.query(where, order_by=order_by, limit=limit)),
+                                     self.expected(where, order_by, limit))
+
+    def test_lazy_top_k_by_year(self):
+        results = self.library.query(Eq('status', 'в наличии'), order_by='-year', limit=5)
+        self.assertFalse(isinstance(results, list))
+        with patch.object(Eq, 'matches', autospec=True, side_effect=lambda self, book: book.status == 'в наличии') \
+                as matches:
+            books = list(results)
+        self.assertEqual(self.ids(books), self.expected(Eq('status', 'в наличии'), '-year', 5))
+        self.assertLess(matches.call_count, 40)
+
+    def test_thread_safe(self):
+        library = Library(self.test_file_path, thread_safe=True)
+        where = Range('year', 1990) & Eq('status', 'выдана')
+        self.assertEqual(self.ids(library.query(where, order_by='-title', limit=10)),
+                         self.expected(where, '-title', 10))
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            Eq('publisher', 'x')
+        with self.assertRaises(ValueError):
+            list(self.library.query(order_by='-publisher'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import json
+import os
+import random
+import tempfile
+from library.cache import SearchCache
+from library.library import Library
+
+
+class TestSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump([{'id': 1, 'title': 'Title1', 'author': 'Author1', 'year': 2000, 'status': 'в наличии'},
+                       {'id': 2, 'title': 'Title2', 'author': 'Author2', 'year': 2001, 'status': 'в наличии'},
+                       {'id': 3, 'title': 'Other', 'author': 'Author1', 'year': 2001, 'status': 'выдана'}], file)
+        self.library = Library(self.test_file_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key_is_normalized(self):
+        self.assertEqual(SearchCache.key('exact', None, {'author': 'AUTHOR1', 'year': '2000', 'title': None}),
+                         SearchCache.key('exact', None, {'year': 2000, 'author': 'author1'}))
+
+    def test_hits_and_misses(self):
+        first = self.library.search_book(author='Author1')
+        first.clear()
+        self.assertEqual([book.book_id for book in self.library.search_book(author='author1')], [1, 3])
+        self.assertEqual(self.library.cache_info(), {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 128})
+
+    def test_lru_eviction(self):
+        library = Library(self.test_file_path, cache_size=2)
+        library.search_book(year=2000)
+        library.search_book(year=2001)
+        library.search_book(year=2000)
+        library.search_book(author='Author2')
+        library.search_book(year=2000)
+        library.search_book(year=2001)
+        self.assertEqual(library.cache_info(), {'hits': 2, 'misses': 4, 'size': 2, 'maxsize': 2})
+
+    def test_precise_invalidation(self):
+        self.library.search_book(author='Author1')
+        self.library.search_book(author='Author2')
+        self.library.search_book(status='выдана')
+        self.library.search_book(mode='prefix', title='tit')
+        self.library.update_book_status(2, 'выдана')
+        self.assertEqual(self.library.cache_info()['size'], 1)
+        self.assertEqual([book.book_id for book in self.library.search_book(status='выдана')], [2, 3])
+        self.library.add_book('Other', 'Author3', 2002)
+        self.library.search_book(author='Author1')
+        self.assertEqual(self.library.cache_info()['hits'], 1)
+        self.library.delete_book(3)
+        self.assertEqual([book.book_id for book in self.library.search_book(author='Author1')], [1])
+        self.assertEqual([book.book_id for book in self.library.search_book(title='other')], [4])
+
+    def test_disabled(self):
+        library = Library(self.test_file_path, cache_size=0)
+        library.search_book(author='Author1')
+        self.assertEqual(library.cache_info(), {})
+
+    def test_matches_uncached_search(self):
+        rng = random.Random(0)
+        uncached = Library(self.test_file_path, cache_size=0)
+        queries = [dict(mode=mode, author=author, status=status)
+                   for mode in ('exact', 'prefix', 'substring', 'fuzzy')
+                   for author in ('Author1', 'Author2', 'auth', 'Autor3', None)
+                   for status in ('в наличии', 'выдана', None)]
+        for step in range(200):
+            for library in (self.library, uncached):
+                rng.seed(step)
+                match step % 4:
+                    case 0:
+                        library.add_book(f'Title{step}', f'Author{step % 3 + 1}', 2000 + step % 3)
+                    case 1:
+                        library.update_book_status(rng.choice(library.books).book_id, rng.choice(['в наличии', 'выдана']))
+                    case 2:
+                        library.delete_book(rng.choice(library.books).book_id)
+                    case 3:
+                        library.update_statuses({book.book_id: 'в наличии' for book in library.books[:2]})
+            for query in rng.sample(queries, 10):
+                self.assertEqual([book.book_id for book in self.library.search_book(**query)],
+                                 [book.book_id for book in uncached.search_book(**query)], (step, query))
+        self.assertGreater(self.library.cache_info()['hits'], 0)
+
+    def test_rollback_clears_cache(self):
+        self.library.search_book(author='Author1')
+        with self.assertRaises(RuntimeError):
+            with self.library.transaction():
+                self.library.add_book('Title4', 'Author1', 2002)
+                self.assertEqual(len(self.library.search_book(author='Author1')), 3)
+                raise RuntimeError
+        self.assertEqual([book.book_id for book in self.library.search_book(author='Author1')], [1, 3])
@@ -0,0 +1,117 @@
+import unittest
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from library.library import Library
+from library.storage import JsonStorage, ShardedStorage, migrate_json_to_shards
+
+
+class TestShardedStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, 'shards')
+        self.library = Library(self.directory, storage=ShardedStorage(self.directory, shard_size=10))
+        self.library.add_books((f'Title{number}', f'Author{number % 3}', 2000 + number) for number in range(1, 36))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open(self, **kwargs):
+        return Library(self.directory, storage=ShardedStorage(self.directory), **kwargs)
+
+    def shard_books(self, storage, shard):
+        with open(storage._shard_path(shard), 'r', encoding='utf-8') as file:
+            return [book['id'] for book in json.load(file)]
+
+    def book_tuples(self, library):
+        return [(book.book_id, book.title, book.author, book.year, book.status) for book in library.books]
+
+    def test_partition_by_id_range(self):
+        storage = self.library.storage
+        self.assertEqual(storage.shards(), [0, 1, 2, 3])
+        self.assertEqual(self.shard_books(storage, 0), list(range(1, 10)))
+        self.assertEqual(self.shard_books(storage, 3), list(range(30, 36)))
+        self.assertEqual(self.book_tuples(self.open()), self.book_tuples(self.library))
+
+    def test_only_dirty_shards_rewritten(self):
+        storage = self.library.storage
+        with patch.object(JsonStorage, 'save', autospec=True, return_value=0) as save:
+            self.library.update_book_status(12, 'выдана')
+            self.library.delete_book(25)
+        self.assertEqual([call.args[0].file_path for call in save.call_args_list],
+                         [storage._shard_path(1), storage._shard_path(2)])
+
+    def test_changes_persist(self):
+        self.library.update_book_status(12, 'выдана')
+        self.library.delete_book(25)
+        self.library.add_book('Title36', 'Author0', 2036)
+        self.assertEqual(self.book_tuples(self.open()), self.book_tuples(self.library))
+
+    def test_lazy_loading(self):
+        library = self.open()
+        self.assertEqual(library._unloaded, {0, 1, 2})
+        self.assertEqual(library.next_id, 36)
+        self.assertEqual(library.get_book(15).title, 'Title15')
+        self.assertEqual(library._unloaded, {0, 2})
+        self.assertTrue(library.update_book_status(5, 'выдана'))
+        self.assertEqual(library._unloaded, {2})
+        self.assertEqual(library.summary()['total'], 35)
+        self.assertEqual(library._unloaded, set())
+        self.assertEqual([book.book_id for book in library.search_book(author='Author1')],
+                         list(range(1, 36, 3)))
+        self.assertEqual(self.book_tuples(library), self.book_tuples(self.open(thread_safe=True)))
+
+    def test_lazy_add_after_emptied_shard(self):
+        for book_id in range(30, 36):
+            self.library.delete_book(book_id)
+        library = self.open()
+        self.assertEqual(library.next_id, 30)
+        library.add_book('Title30', 'Author0', 2030)
+        self.assertEqual(len(self.open().books), 30)
+
+    def test_lazy_transaction_rollback(self):
+        library = self.open()
+        with self.assertRaises(RuntimeError):
+            with library.transaction():
+                library.update_book_status(3, 'выдана')
+                library.add_book('Title36', 'Author0', 2036)
+                raise RuntimeError
+        self.assertEqual(library.get_book(3).status, 'в наличии')
+        self.assertIsNone(library.get_book(36))
+        self.assertEqual(self.book_tuples(library), self.book_tuples(self.open()))
+
+    def test_rebalance(self):
+        for book_id in range(1, 30):
+            if book_id % 4:
+                self.library.delete_book(book_id)
+        expected = self.book_tuples(self.open())
+        storage = ShardedStorage(self.directory)
+        old_generation = storage._generation_path()
+        self.assertEqual(storage.rebalance(4), 4)
+        self.assertFalse(os.path.exists(old_generation))
+        self.assertEqual([len(storage.load_shard(shard)) for shard in storage.shards()], [4, 4, 4, 1])
+        library = self.open()
+        self.assertEqual(self.book_tuples(library), expected)
+        library.add_books(('New', 'Author', 2000) for _ in range(5))
+        self.assertEqual(self.open().storage.shards(), [0, 1, 2, 3, 4])
+
+    def test_version_changes(self):
+        storage = ShardedStorage(self.directory)
+        version = storage.version()
+        self.library.update_book_status(1, 'выдана')
+        self.assertNotEqual(storage.version(), version)
+
+    def test_migrate(self):
+        json_path = os.path.join(self.temp_dir.name, 'library.json')
+        JsonStorage(json_path).save(self.library.books)
+        directory = os.path.join(self.temp_dir.name, 'migrated')
+        self.assertEqual(migrate_json_to_shards(json_path, directory, 20), 35)
+        storage = ShardedStorage(directory)
+        self.assertEqual(storage.shards(), [0, 1])
+        self.assertEqual(self.book_tuples(Library(directory, storage=storage)), self.book_tuples(self.library))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from library.library import Library
+from library.storage import JsonStorage
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file_path = os.path.join(self.temp_dir.name, 'test_library.json')
+        self.snapshot_path = self.test_file_path + '.snapshot'
+        self.write_books([{'id': 1, 'title': 'Title1', 'author': 'Author1', 'year': 2000, 'status': 'в наличии'},
+                          {'id': 3, 'title': 'Заглавие', 'author': 'Автор', 'year': 1999, 'status': 'выдана'}])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_books(self, books):
+        with open(self.test_file_path, 'w', encoding='utf-8') as file:
+            json.dump(books, file, ensure_ascii=False)
+
+    def book_tuples(self, library):
+        return [(book.book_id, book.title, book.author, book.year, book.status) for book in library.books]
+
+    def test_warm_start_skips_json(self):
+        cold = Library(self.test_file_path)
+        self.assertTrue(os.path.exists(self.snapshot_path))
+        with patch('library.storage.iter_json_array', side_effect=AssertionError('JSON parsed')):
+            warm = Library(self.test_file_path)
+        self.assertEqual(self.book_tuples(warm), self.book_tuples(cold))
+        self.assertEqual(warm.next_id, 4)
+
+    def test_stale_snapshot(self):
+        Library(self.test_file_path)
+        self.write_books([{'id': 2, 'title': 'Title2', 'author': 'Author2', 'year': 2001, 'status': 'в наличии'}])
+        self.assertEqual(self.book_tuples(Library(self.test_file_path)), [(2, 'Title2', 'Author2', 2001, 'в наличии')])
+
+    def test_same_size_and_mtime(self):
+        Library(self.test_file_path)
+        stat = os.stat(self.test_file_path)
+        self.write_books([{'id': 1, 'title': 'Title2', 'author': 'Author1', 'year': 2000, 'status': 'в наличии'},
+                          {'id': 3, 'title': 'Заглавие', 'author': 'Автор', 'year': 1999, 'status': 'выдана'}])
+        os.utime(self.test_file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.book_tuples(Library(self.test_file_path))[0][1], 'Title2')
+
+    def test_corrupted_snapshot(self):
+        expected = self.book_tuples(Library(self.test_file_path))
+        with open(self.snapshot_path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.snapshot_path) - 3)
+        self.assertEqual(self.book_tuples(Library(self.test_file_path)), expected)
+
+    def test_save_refreshes_snapshot(self):
+        library = Library(self.test_file_path)
+        library.add_book('Title4', 'Author4', 2004)
+        library.update_book_status(1, 'выдана')
+        with patch('library.storage.iter_json_array', side_effect=AssertionError('JSON parsed')):
+            self.assertEqual(self.book_tuples(Library(self.test_file_path)), self.book_tuples(library))
+
+    def test_journal_is_replayed_over_snapshot(self):
+        library = Library(self.test_file_path, journal=True)
+        library.add_book('Title4', 'Author4', 2004)
+        with patch('library.storage.iter_json_array', side_effect=AssertionError('JSON parsed')):
+            self.assertEqual(self.book_tuples(Library(self.test_file_path, journal=True)), self.book_tuples(library))
+
+    def test_disabled(self):
+        Library(self.test_file_path, storage=JsonStorage(self.test_file_path, snapshot=False))
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+    def test_books_that_do_not_fit(self):
+        self.write_books([{'id': 1, 'title': 'Title\u0000', 'author': 'Author1', 'year': 2000, 'status': 'в наличии'}])
+        Library(self.test_file_path)
+        self.assertFalse(os.path.exists(self.snapshot_path))
@@ -0,0 +1,80 @@
+import unittest
+import json
+import os
+from unittest.mock import patch
+from library.library import Library
+from library.storage import SqliteStorage, migrate_json_to_sqlite
+import tempfile
+
+class TestSqliteStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'test_library.db')
+        self.storage = SqliteStorage(self.db_path)
+        self.library = Library(self.db_path, storage=self.storage)
+        self.library.add_books([('Title1', 'Author1', 2000), ('Title2', 'Author2', 2001), ('title1', 'Автор', 2001)])
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    def reload(self):
+        storage = SqliteStorage(self.db_path)
+        self.addCleanup(storage.close)
+        return Library(self.db_path, storage=storage)
+
+    def test_mutations_are_persisted(self):
+        self.library.update_book_status(1, 'выдана')
+        self.library.delete_book(2)
+        self.library.add_book('Title4', 'Author4', 2003)
+        library = self.reload()
+        self.assertEqual([book.book_id for book in library.books], [1, 3, 4])
+        self.assertEqual(library.books[0].status, 'выдана')
+        self.assertEqual(library.next_id, 5)
+
+    def test_search_matches_library(self):
+        self.library.update_book_status(3, 'выдана')
+        resident = Library(self.db_path, storage=self.storage, thread_safe=True)
+        for criteria in ({'title': 'TITLE1'}, {'author': 'автор'}, {'year': '2001'},
+                         {'title': 'title1', 'status': 'Выдана'}, {'title': None}, {'id': 1}):
+            expected = [book.book_id for book in resident.search_book(**criteria)]
+            self.assertEqual([book.book_id for book in self.library.search_book(**criteria)], expected)
+        self.assertEqual([book.book_id for book in self.library.search_book(year=2001, limit=1)], [2])
+
+    def test_not_resident(self):
+        with patch.object(self.storage, 'load', side_effect=AssertionError('loaded')):
+            library = Library(self.db_path, storage=self.storage)
+            self.assertEqual(library.next_id, 4)
+            self.assertEqual(library.get_book(2).title, 'Title2')
+            self.assertIsNone(library.get_book(9))
+            self.assertEqual([book.book_id for book in library.search_book(title='title1')], [1, 3])
+            self.assertTrue(library.update_book_status(1, 'выдана'))
+            self.assertEqual([book.book_id for book in library.search_book(status='выдана')], [1])
+            self.assertTrue(library.delete_book(3))
+            self.assertFalse(library.delete_book(3))
+            library.add_book('Title4', 'Author4', 2003)
+            self.assertEqual([book.book_id for book in library.search_book(title='title1')], [1])
+            self.assertEqual(library.update_statuses({2: 'выдана', 9: 'выдана'}), 1)
+        self.assertEqual([(book.book_id, book.status) for book in library.books],
+                         [(1, 'выдана'), (2, 'выдана'), (4, 'в наличии')])
+        self.assertEqual(library.summary()['by_status'], {'выдана': 2, 'в наличии': 1})
+
+    def test_search_uses_index(self):
+        plan = self.storage.connection.execute(
+            'EXPLAIN QUERY PLAN SELECT id FROM books WHERE author_key = ?', ('author1',)).fetchall()
+        self.assertIn('books_author_key', ' '.join(str(row) for row in plan))
+
+    def test_migrate_json_to_sqlite(self):
+        json_path = os.path.join(self.temp_dir.name, 'library.json')
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump([{'id': 7, 'title': 'Title7', 'author': 'Author7', 'year': 1999, 'status': 'выдана'}], file)
+        db_path = os.path.join(self.temp_dir.name, 'migrated.db')
+        self.assertEqual(migrate_json_to_sqlite(json_path, db_path), 1)
+        storage = SqliteStorage(db_path)
+        self.addCleanup(storage.close)
+        self.assertEqual([book.to_dict() for book in storage.load()],
+                         [{'id': 7, 'title': 'Title7', 'author': 'Author7', 'year': 1999, 'status': 'выдана'}])
+
+if __name__ == '__main__':
+    unittest.main()